@@ -0,0 +1,128 @@
+import os
+import sys
+import struct
+import zlib
+
+sys.path.insert(0, os.path.join(".", "pibody", "graphics"))
+import image  # noqa: E402
+
+PNG_DIR = os.path.join(".", "pibody", "Demo", "module_pngs")
+OUTPUT_FILE = os.path.join(".", "pibody", "Demo", "module_images.atlas")
+
+# Pixels with a lower alpha are left transparent (not drawn)
+ALPHA_THRESHOLD = 128
+
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+def read_png(path):
+    """Decode a non-interlaced PNG into (width, height, rows of (r, g, b, a) tuples)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"{path} is not a PNG file")
+    pos = 8
+    idat = b""
+    palette = []
+    alpha = b""
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"PLTE":
+            palette = [tuple(chunk[i:i + 3]) for i in range(0, len(chunk), 3)]
+        elif kind == b"tRNS":
+            alpha = chunk
+        elif kind == b"IDAT":
+            idat += chunk
+        elif kind == b"IEND":
+            break
+    if interlace:
+        raise ValueError(f"{path}: interlaced PNGs are not supported")
+    if depth != 8 and color_type != 3:
+        raise ValueError(f"{path}: only 8-bit channels are supported")
+
+    raw = zlib.decompress(idat)
+    bits = CHANNELS[color_type] * depth
+    stride = (width * bits + 7) // 8
+    bpp = max(bits // 8, 1)
+    rows = []
+    prev = bytearray(stride)
+    pos = 0
+    for _ in range(height):
+        kind = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        unfilter(kind, line, prev, bpp)
+        rows.append(decode_row(line, width, depth, color_type, palette, alpha))
+        prev = line
+    return width, height, rows
+
+def unfilter(kind, line, prev, bpp):
+    for i in range(len(line)):
+        left = line[i - bpp] if i >= bpp else 0
+        up = prev[i]
+        corner = prev[i - bpp] if i >= bpp else 0
+        if kind == 1:
+            line[i] = (line[i] + left) & 0xFF
+        elif kind == 2:
+            line[i] = (line[i] + up) & 0xFF
+        elif kind == 3:
+            line[i] = (line[i] + (left + up) // 2) & 0xFF
+        elif kind == 4:
+            p = left + up - corner
+            pa, pb, pc = abs(p - left), abs(p - up), abs(p - corner)
+            predictor = left if pa <= pb and pa <= pc else up if pb <= pc else corner
+            line[i] = (line[i] + predictor) & 0xFF
+
+def decode_row(line, width, depth, color_type, palette, alpha):
+    if color_type == 3:
+        per_byte = 8 // depth
+        mask = (1 << depth) - 1
+        pixels = []
+        for x in range(width):
+            byte = line[x // per_byte]
+            index = (byte >> (8 - depth * (x % per_byte + 1))) & mask
+            a = alpha[index] if index < len(alpha) else 255
+            pixels.append(palette[index] + (a,))
+        return pixels
+    n = CHANNELS[color_type]
+    pixels = []
+    for x in range(width):
+        p = line[x * n:(x + 1) * n]
+        if color_type == 0:
+            pixels.append((p[0], p[0], p[0], 255))
+        elif color_type == 4:
+            pixels.append((p[0], p[0], p[0], p[1]))
+        elif color_type == 2:
+            pixels.append((p[0], p[1], p[2], 255))
+        else:
+            pixels.append((p[0], p[1], p[2], p[3]))
+    return pixels
+
+def color565(r, g, b):
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+def encode(width, height, rows):
+    out = bytearray(image.header(width, height))
+    for row in rows:
+        pixels = [color565(r, g, b) if a >= ALPHA_THRESHOLD else None for r, g, b, a in row]
+        image.encode_row(pixels, out.extend)
+    return bytes(out)
+
+def convert_all(png_dir, output_file):
+    images = []
+    for filename in sorted(os.listdir(png_dir)):
+        if not filename.endswith(".png"):
+            continue
+        width, height, rows = read_png(os.path.join(png_dir, filename))
+        data = encode(width, height, rows)
+        images.append((filename[:-4], data))
+        print(f"{filename}: {width}x{height} -> {len(data)} bytes")
+    with open(output_file, "wb") as f:
+        image.write_atlas(images, f.write)
+    print(f"Atlas written to {output_file} ({os.path.getsize(output_file)} bytes)")
+
+if __name__ == "__main__":
+    convert_all(PNG_DIR, OUTPUT_FILE)
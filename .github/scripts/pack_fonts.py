@@ -0,0 +1,27 @@
+import os
+import sys
+import importlib.util
+
+sys.path.insert(0, os.path.join(".", "pibody", "graphics"))
+from flashfont import pack  # noqa: E402
+
+OUTPUT_DIR = os.path.join(".", "pibody", "fonts")
+
+# Usage: python .github/scripts/pack_fonts.py path/to/vga2_8x16.py [more fonts...]
+# Font modules are the st7789_mpy bitmap fonts (WIDTH, HEIGHT, FIRST, LAST, FONT)
+
+def load_font(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return name, module
+
+if __name__ == "__main__":
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    for path in sys.argv[1:]:
+        name, font = load_font(path)
+        out = os.path.join(OUTPUT_DIR, name + ".pbf")
+        with open(out, "wb") as f:
+            pack(font, f.write)
+        print(f"{path} -> {out} ({os.path.getsize(out)} bytes)")
@@ -1,20 +1,9 @@
 from machine import Pin
-import time
-from ..hinter import Hinter
-from ..tester import Tester
-from ..projectConfig import ProjectConfig
+from ..tester import AsyncTester
+from ..aio import fade_to
 from ..module import Module
 from pibody import display
-hinter = Hinter()
-
-project_config = ProjectConfig(
-    title="Dimming System",
-    modules=[
-        Module(Module.LED_R, "A"),
-        Module(Module.MOTION_SENSOR, "B"),
-        Module(Module.LIGHT_SENSOR, "C")
-    ]
-)
+from pibody.graphics.widgets import Label, NumberField
 
 light_treshold = 37500  # максимальное значение для светодиода
 dim_brightness = 2500   # начальная яркость светодиода
@@ -26,21 +15,14 @@ length = 200
 height = 9
 border = True
 
-def fade_to(brightness, led, step=1000, delay=0.01):
-    current = led.duty_u16()
-    if brightness > current:
-        for i in range(current, brightness, step):
-            led.duty_u16(i)
-            time.sleep(delay)
-    else:
-        for i in range(current, brightness, -step):
-            led.duty_u16(i)
-            time.sleep(delay)
-    led.duty_u16(brightness)
+status = Label(x, y - 22, 26)
+light_field = NumberField(x, y + 9, 5, prefix="Light value: ", suffix="/28035")
+
+class DimmingTester(AsyncTester):
+    rate = 20
 
-class DimmingTester(Tester):
-    def __init__(self):
-        super().__init__(project_config)
+    def __init__(self, config):
+        super().__init__(config)
         self.color = display.color(0, 0, 0)
 
     def init(self):
@@ -53,26 +35,33 @@ class DimmingTester(Tester):
                 self.motion = module.getPin(Pin.IN)
             if module.name == Module.LIGHT_SENSOR:
                 self.light = module.getADC()
+        self.target = None
+        self.fade = None
+
+    def fade_led(self, brightness):
+        # Runs next to the loop so the readouts keep updating while the LED fades
+        if brightness == self.target:
+            return
+        self.target = brightness
+        if self.fade is not None:
+            self.fade.cancel()
+        self.fade = self.spawn(fade_to(self.led, brightness))
 
-    def loop(self):
+    async def loop(self):
         light_value = self.light.read_u16()
         motion_value = self.motion.value()
 
-        display.text("Light Sensor is working   ", x, y - 22)
-        display.text("Light value: " + str(65535 - light_value) + "/28035          ", x, y + 9)
-        display.linear_bar(x, y, length, value=65535 - light_value, min_value=0, max_value=65535, height=height, border=True, color=self.color)
+        status.set("Light Sensor is working")
+        light_field.set(65535 - light_value)
+        display.linear_bar(x, y, length, value=65535 - light_value, min_value=0, max_value=65535, height=height, border=True, color=self.color, incremental=True)
 
         if light_value > light_treshold:
             self.color = display.color(64, 64, 64)
-            fade_to(0, self.led)
+            self.fade_led(0)
             return
         if motion_value == 1:
             self.color = display.color(255, 255, 0)
-            fade_to(full_brightness, self.led)
+            self.fade_led(full_brightness)
         else:
             self.color = display.color(88, 88, 0)
-            fade_to(dim_brightness, self.led)
-
-        if not self.isRunning:
-            hinter.drawModules(project_config)
-            return
+            self.fade_led(dim_brightness)
@@ -1,24 +1,12 @@
 from machine import Pin
 from pibody import GyroAccel
-from ..tester import Tester
+from ..tester import AsyncTester
+from ..aio import beep
 from ..module import Module
-from ..projectConfig import ProjectConfig
-from ..hinter import Hinter
 from pibody import display
+from pibody.graphics.sprite import Sprite
 import time
 
-hinter = Hinter()
-
-project_config = ProjectConfig(
-    title = "GyroPong",
-    modules=[
-        Module(Module.LED_R, "A"),
-        Module(Module.LED_Y, "B"),
-        Module(Module.LED_G, "C"),
-        Module(Module.BUZZER, "D"),
-        Module(Module.GYRO_ACCEL, "E")
-    ]
-)
 
 treshold = 0.5 
 led_index = 0
@@ -44,29 +32,29 @@ freq_map = {
     2: 220,  # C4
 } 
 
-def beep(buzzer, freq, duration=0.05):
-    buzzer.freq(freq)
-    buzzer.duty_u16(4096)
-    time.sleep(duration)
-    buzzer.duty_u16(0)
-
 def change_index(index, change):
     index += change
     index = min(max(index, 0), len(freq_map) - 1)
     return index
 
-def update_leds(leds, index):
+def make_led_sprite(i):
+    # Frame 0 is the dimmed LED, frame 1 the lit one
+    sprite = Sprite(2 * r + 1, 2 * r + 1, frames=2, key=0, x=x - r, y=y + i * 22 - r)
+    sprite.frames[0].fill_circle(r, r, r, dim_color_map[i])
+    sprite.frames[1].fill_circle(r, r, r, color_map[i])
+    return sprite
+
+def update_leds(leds, sprites, index):
     for i in range(len(leds)):
         if i == index:
             leds[i].on()
-            display.fill_circle(x, y + i * 22, r, color_map[i])
         else:
             leds[i].off()
-            display.fill_circle(x, y + i * 22, r, dim_color_map[i])
+        sprites.sprites[i].show(1 if i == index else 0)
+    sprites.update()
 
-class GyroPongTester(Tester):
-    def __init__(self):
-        super().__init__(project_config)
+class GyroPongTester(AsyncTester):
+    rate = 10
 
     def init(self):
         super().init()
@@ -83,8 +71,11 @@ class GyroPongTester(Tester):
             if module.name == Module.GYRO_ACCEL:
                 self.gyro_accel = GyroAccel(module.getSlot())
         self.leds = [self.led_r, self.led_y, self.led_g]
+        self.sprites = display.sprites()
+        for i in range(len(self.leds)):
+            self.sprites.add(make_led_sprite(i))
 
-    def loop(self):
+    async def loop(self):
         global led_index, last_time, last_index
         x, y, z = self.gyro_accel.read_accel()
 
@@ -93,7 +84,7 @@ class GyroPongTester(Tester):
                 led_index = change_index(led_index, -1)
                 last_time = time.ticks_ms()
                 if last_index != led_index:
-                    beep(self.buzzer, freq_map[led_index])
+                    self.spawn(beep(self.buzzer, freq_map[led_index]))
                     last_index = led_index
 
         elif x < -treshold:
@@ -101,12 +92,7 @@ class GyroPongTester(Tester):
                 led_index = change_index(led_index, 1)
                 last_time = time.ticks_ms()
                 if last_index != led_index:
-                    beep(self.buzzer, freq_map[led_index])
+                    self.spawn(beep(self.buzzer, freq_map[led_index]))
                     last_index = led_index
 
-        update_leds(self.leds, led_index)
-        time.sleep(0.1)
-
-        if not self.isRunning:
-            hinter.drawModules(project_config)
-            return
+        update_leds(self.leds, self.sprites, led_index)
@@ -1,19 +1,7 @@
 from ..tester import Tester
 from ..module import Module
-from ..hinter import Hinter
-from ..projectConfig import ProjectConfig
 import math
 
-hinter = Hinter()
-
-project_config = ProjectConfig(
-    title="Joystick",
-    modules=[
-        Module(Module.JOYSTICK, "F")
-    ],
-    servo8=True,
-    servo9=True
-)
 
 def angle_to_duty(angle):
     min_u16 = int((0.5 / 20) * 65535)
@@ -26,9 +14,6 @@ def joystick_to_angle(raw_val):
     return int(eased * 180)
 
 class JoystickTester(Tester):
-    def __init__(self):
-        super().__init__(project_config)
-
     def init(self):
         super().init()
         for module in self.modules:
@@ -46,8 +31,3 @@ class JoystickTester(Tester):
 
         self.servo.duty_u16(angle_to_duty(angle0))
         self.servo9.duty_u16(angle_to_duty(angle1))
-
-        if not self.isRunning:
-            hinter.drawModules(project_config)
-            return
-
@@ -1,26 +1,10 @@
-from machine import Pin, ADC
-from time import sleep, ticks_ms
+from machine import Pin
+from time import ticks_ms
 from pibody import Encoder
 from ..module import Module 
-from ..projectConfig import ProjectConfig
-from ..tester import Tester
-from ..hinter import Hinter
-import gc
-
-hinter = Hinter()
-
-project_config = ProjectConfig(
-    title="RGB Tester",
-    modules=[
-        Module(Module.BUTTON_BLUE, "A"),
-        Module(Module.BUTTON_YELLOW, "B"),
-        Module(Module.POTENTIOMETER, "C"),
-        Module(Module.ENCODER, "D"),
-        Module(Module.SWITCH, "E"),
-        Module(Module.TOUCH_SENSOR, "F")
-    ],
-    led_tower=True
-)
+from ..tester import AsyncTester
+
+
 class ModeManager:
     def __init__(self, np, adc, encoder, n=8):
         self.np = np
@@ -89,8 +73,8 @@ class ModeManager:
                 r, g, b = 0, pos * 3, 255 - pos * 3
             self.np[i] = self.apply_brightness((r, g, b))
         self.np.write()
-        self.rainbow_offset = (self.rainbow_offset + 1) % 256
-        sleep(self.speed / 1000)
+        # One step every speed ms, the tester's frame rate paces the writes
+        self.rainbow_offset = (ticks_ms() // self.speed) % 256
 
     def mode_comet(self):
         self.update_speed()
@@ -128,9 +112,9 @@ class ModeManager:
         self.modes[self.current_mode][1]()
 
 
-class NeoPixelTester(Tester):
-    def __init__(self):
-        super().__init__(project_config)
+class NeoPixelTester(AsyncTester):
+    rate = 100
+
     def init(self):
         super().init()
         for module in self.modules:
@@ -151,6 +135,7 @@ class NeoPixelTester(Tester):
 
         self.last_button_press = 0
         self.debounce = 200
+        self.off = False
 
     def debounce_check(self):
         return ticks_ms() - self.last_button_press > self.debounce
@@ -178,15 +163,13 @@ class NeoPixelTester(Tester):
             self.last_button_press = ticks_ms()
             # while self.btn_color.value() == 1: sleep(0.001)
 
-    def loop(self):
+    async def loop(self):
         self.handle_buttons()
         if self.switch.value() == 0:
-            self.manager.mode_off()
-            sleep(0.1)
+            # Blank the tower once instead of rewriting it every frame
+            if not self.off:
+                self.manager.mode_off()
+                self.off = True
             return
+        self.off = False
         self.manager.run_current_mode()
-        sleep(0.005)
-
-        if not self.isRunning:
-            hinter.drawModules(project_config)
-            return
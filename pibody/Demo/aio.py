@@ -0,0 +1,35 @@
+# Awaitable versions of the blocking helpers used by the testers
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+
+async def fade_to(pwm, brightness, step=1000, delay_ms=10):
+    # Ramp a PWM duty cycle to brightness, one step every delay_ms
+    current = pwm.duty_u16()
+    step = step if brightness > current else -step
+    for duty in range(current, brightness, step):
+        pwm.duty_u16(duty)
+        await asyncio.sleep_ms(delay_ms)
+    pwm.duty_u16(brightness)
+
+
+async def beep(buzzer, freq, duration_ms=50):
+    buzzer.freq(freq)
+    buzzer.duty_u16(4096)
+    try:
+        await asyncio.sleep_ms(duration_ms)
+    finally:
+        buzzer.duty_u16(0)
+
+
+async def wait_for(pin, value=1, poll_ms=10, timeout_ms=None):
+    # Wait until the pin reads value, False on timeout
+    waited = 0
+    while pin.value() != value:
+        if timeout_ms is not None and waited >= timeout_ms:
+            return False
+        await asyncio.sleep_ms(poll_ms)
+        waited += poll_ms
+    return True
@@ -0,0 +1,99 @@
+from machine import Pin
+from array import array
+import machine
+import time
+
+START = 0
+SELECT = 1
+
+
+class ButtonEvents:
+    """Debounced button presses posted from pin IRQs to a small queue.
+
+    The IRQ handlers only write into preallocated arrays. wait() sleeps the
+    core between events and keeps the IRQ-to-handling latency of every
+    event it returns.
+    """
+    SIZE = 8
+    # Longest lightsleep, also the worst case latency if a pin can't wake the core
+    LIGHTSLEEP_MS = 20
+
+    def __init__(self, debounce_ms=50, low_power=False):
+        self.debounce_ms = debounce_ms
+        self.low_power = low_power
+        self._events = array("b", [0] * self.SIZE)
+        self._stamps = array("i", [0] * self.SIZE)
+        self._head = 0
+        self._count = 0
+        self._last = array("i", [0] * 8)
+        self.dropped = 0
+        # Latency in us: events measured, total and worst
+        self.handled = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def attach(self, pin, event):
+        def handler(p):
+            self._post(p, event)
+        pin.irq(trigger=Pin.IRQ_RISING, handler=handler)
+
+    def detach(self, pin):
+        pin.irq(handler=None)
+
+    def _post(self, pin, event):
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._last[event]) < self.debounce_ms or pin.value() == 0:
+            return
+        self._last[event] = now
+        if self._count == self.SIZE:
+            self.dropped += 1
+            return
+        i = (self._head + self._count) % self.SIZE
+        self._events[i] = event
+        self._stamps[i] = time.ticks_us()
+        self._count += 1
+
+    def get(self):
+        # Oldest pending event, None when the queue is empty
+        state = machine.disable_irq()
+        if self._count == 0:
+            machine.enable_irq(state)
+            return None
+        i = self._head
+        event = self._events[i]
+        stamp = self._stamps[i]
+        self._head = (i + 1) % self.SIZE
+        self._count -= 1
+        machine.enable_irq(state)
+        latency = time.ticks_diff(time.ticks_us(), stamp)
+        self.handled += 1
+        self.total_us += latency
+        if latency > self.max_us:
+            self.max_us = latency
+        return event
+
+    def wait(self, idle=None):
+        """Return the next event, sleeping until one arrives.
+
+        idle() is called first while it reports having done some work.
+        """
+        while True:
+            event = self.get()
+            if event is not None:
+                return event
+            if idle is not None and idle():
+                continue
+            if self.low_power:
+                machine.lightsleep(self.LIGHTSLEEP_MS)
+            else:
+                machine.idle()
+
+    def clear(self):
+        state = machine.disable_irq()
+        self._count = 0
+        machine.enable_irq(state)
+
+    def report(self):
+        avg = self.total_us // self.handled if self.handled else 0
+        print("Button events: {} handled, latency avg {} us, max {} us, {} dropped".format(
+            self.handled, avg, self.max_us, self.dropped))
@@ -1,6 +1,7 @@
 from pibody import display
 from pibody.Demo.module import Module
 from pibody.Demo.projectConfig import ProjectConfig
+from pibody.Demo.prefetch import ImageCache
 import gc
 import time
 
@@ -14,7 +15,35 @@ SLOTS_COORDS = {
     "F": (150, 180)
 }
 
+# Screen regions (x, y, w, h) drawModules keeps track of, in drawing order
+REGIONS = {slot: (x, y, 80, 80) for slot, (x, y) in SLOTS_COORDS.items()}
+REGIONS["title"] = (10, 265, 230, 32)
+REGIONS["footer"] = (0, 300, 240, 20)
+REGIONS["led_tower"] = (110, 0, 19, 195)
+REGIONS["servo"] = (90, 200, 62, 66)
+DRAW_ORDER = ("A", "B", "C", "D", "E", "F", "title", "footer", "led_tower", "servo")
+
 png_path = "pibody/Demo/module_pngs/"
+# R565 versions of all the PNGs in one file, built by .github/scripts/convert_images.py
+atlas_path = "pibody/Demo/module_images.atlas"
+_atlas = None
+
+def get_atlas():
+    # Opened once, drawing an image is then a seek and sequential reads
+    global _atlas
+    if _atlas is None:
+        from pibody.graphics.image import Atlas
+        try:
+            _atlas = Atlas(atlas_path)
+        except OSError:
+            _atlas = False
+    return _atlas
+
+# Images of the next screen, read ahead while the Demo waits for a button
+image_cache = ImageCache()
+
+def image_name(path):
+    return path[path.rfind("/") + 1:-4]
 
 def safe_draw_png(path, x, y, retries=10, delay=0.1):
     for attempt in range(retries):
@@ -24,13 +53,33 @@ def safe_draw_png(path, x, y, retries=10, delay=0.1):
             return True  # success
         except MemoryError:
             print("MemoryError — retrying ({}/{})...".format(attempt + 1, retries))
+            display.labels.clear()
             gc.collect()
             time.sleep(delay)
     print("Failed to draw PNG after {} retries.".format(retries))
     return False
 
+def draw_image(path, x, y):
+    # Stream the pre-decoded image when there is one, decoding the PNG needs far more RAM
+    name = image_name(path)
+    if image_cache.draw(display, name, x, y):
+        return True
+    atlas = get_atlas()
+    if atlas and name in atlas:
+        atlas.draw(display, name, x, y)
+        return True
+    return safe_draw_png(path, x, y)
+
     
+def _overlap(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
 class Hinter():
+    # Content of each region on screen, shared by all Hinter instances
+    screen = {}
+    epoch = None
+
     def __init__(self):
         self.clear()
 
@@ -39,46 +88,92 @@ class Hinter():
         text_color = display.color(120, 255, 50)  # Green color
         display.text(f"{tester_name}", 10, 120, display.font_bold, text_color, display.BLACK)
         display.text("is running", 10, 150, display.font_bold, text_color, display.BLACK)
-        display.text("GP21", 204, 300, display.font_small, fg=display.CYAN)
-        display.text("cancel", 154, 300, display.font_small)
+        display.label("GP21", 204, 300, display.font_small, fg=display.CYAN)
+        display.label("cancel", 154, 300, display.font_small)
 
     def clear(self):
+        # A display.print() may have left the panel scrolled
+        if display._console is not None:
+            display.console.reset()
         display.fill(display.BLACK)
+        Hinter.screen = {}
 
     def drawModule(self, module :Module, slot):
         x, y = SLOTS_COORDS[slot]
-        safe_draw_png(module.getPngPath(), x, y)
+        draw_image(module.getPngPath(), x, y)
 
-    def drawModules(self, config: ProjectConfig):
-        title = config.getTitle()
-        led_tower = config.getLedTower()
-        servo8 = config.getServo8()
-        servo9 = config.getServo9()
-        modules = config.getModules()
-
-
-        display.fill(display.BLACK)  # Clear the screen
-        for module in modules:
+    def layout(self, config: ProjectConfig):
+        # What drawModules puts in each region, None for an empty region
+        screen = {}
+        for module in config.getModules():
             slot = module.getSlot()
-
             if slot in SLOTS_COORDS:
-                self.drawModule(module, slot)
+                screen[slot] = module.getPngPath()
             else:
                 print(f"Invalid slot: {slot}")
-
-        display.text(title, 10, 265, display.font_bold, display.WHITE, display.BLACK)
-        display.text("GP20", 10, 300, display.font_small, fg=display.CYAN)
-        display.text("start", 44, 300, display.font_small)
-        display.text("GP21", 204, 300, display.font_small, fg=display.CYAN)
-        display.text("next", 170, 300, display.font_small)
-        if led_tower:
-            display.png(f"{png_path}led_tower.png", 110, 0)
+        screen["title"] = config.getTitle()
+        screen["footer"] = "select"
+        if config.getLedTower():
+            screen["led_tower"] = f"{png_path}led_tower.png"
+        servo8 = config.getServo8()
+        servo9 = config.getServo9()
         if servo8 or servo9:
-            display.png(f"{png_path}servo.png", 90, 200)
             txt = "8" if servo8 else ""
             txt += "/" if servo8 and servo9 else ""
             txt += "9" if servo9 else ""
-            display.text(font=display.font_small, text=txt, x=110, y=250, fg=display.WHITE, bg=display.BLACK)
+            screen["servo"] = txt
+        return screen
+
+    def drawModules(self, config: ProjectConfig):
+        # Only regions whose content differs from what is on screen are repainted
+        screen = self.layout(config)
+        if not Hinter.screen or Hinter.epoch != display._epoch:
+            self.clear()
+        old = Hinter.screen
+        changed = [key for key in DRAW_ORDER if old.get(key) != screen.get(key)]
+        for key in changed:
+            if old.get(key) is not None:
+                x, y, w, h = REGIONS[key]
+                display.fill_rect(x, y, w, h, display.BLACK)
+        for key in DRAW_ORDER:
+            if screen.get(key) is None:
+                continue
+            # Unchanged regions overlapping a repainted one are drawn again too
+            if key in changed or any(_overlap(REGIONS[key], REGIONS[c]) for c in changed):
+                self.drawRegion(key, screen[key])
+        Hinter.screen = screen
+        Hinter.epoch = display._epoch
+
+    def prefetch(self, config: ProjectConfig):
+        # Queue the images of a screen so idle() can read them into RAM ahead of time
+        names = []
+        for key, value in self.layout(config).items():
+            if key in SLOTS_COORDS or key == "led_tower":
+                names.append(image_name(value))
+            elif key == "servo":
+                names.append("servo")
+        image_cache.prefetch(names)
+
+    def idle(self):
+        # Do one small piece of prefetch work, False when there is nothing left to do
+        return image_cache.step(get_atlas())
+
+    def drawRegion(self, key, value):
+        if key in SLOTS_COORDS:
+            x, y = SLOTS_COORDS[key]
+            draw_image(value, x, y)
+        elif key == "title":
+            display.text(value, 10, 265, display.font_bold, display.WHITE, display.BLACK)
+        elif key == "footer":
+            display.label("GP20", 10, 300, display.font_small, fg=display.CYAN)
+            display.label("start", 44, 300, display.font_small)
+            display.label("GP21", 204, 300, display.font_small, fg=display.CYAN)
+            display.label("next", 170, 300, display.font_small)
+        elif key == "led_tower":
+            draw_image(value, 110, 0)
+        elif key == "servo":
+            draw_image(f"{png_path}servo.png", 90, 200)
+            display.text(font=display.font_small, text=value, x=110, y=250, fg=display.WHITE, bg=display.BLACK)
 
     def show_error(self, message):
         self.clear()
@@ -87,8 +182,8 @@ class Hinter():
         lines = [message[i:i+28] for i in range(0, len(message), 28)]
         for i, line in enumerate(lines):
             display.text(font=display.font_small, text=line, x=10, y=20 + i * 20, fg=text_color, bg=display.BLACK)
-        display.text("GP20", 10, 300, display.font_small, fg=display.CYAN)
-        display.text("start", 44, 300, display.font_small)
-        display.text("GP21", 204, 300, display.font_small, fg=display.CYAN)
-        display.text("next", 170, 300, display.font_small)
+        display.label("GP20", 10, 300, display.font_small, fg=display.CYAN)
+        display.label("start", 44, 300, display.font_small)
+        display.label("GP21", 204, 300, display.font_small, fg=display.CYAN)
+        display.label("next", 170, 300, display.font_small)
         
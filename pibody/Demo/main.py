@@ -1,10 +1,6 @@
-from .Projects.rgb_tester import NeoPixelTester
-from .Projects.dimming_tester import DimmingTester
-from .Projects.gyropong_tester import GyroPongTester
-from .Projects.joystick_tester import JoystickTester
-from .Projects.any_meter_tester import AnyMeterTester
-from .hinter import Hinter
-from .tester import Tester
+from .hinter import Hinter, image_cache
+from .events import ButtonEvents, START, SELECT
+from .registry import TESTERS, TesterEntry
 from machine import Pin
 from pibody import display
 import gc 
@@ -12,29 +8,29 @@ import gc
 start_button = Pin(20, Pin.IN) 
 select_button = Pin(21, Pin.IN)
 
+LOGO_CACHE = "pibody/Demo/logo_v1.r565"
+
 
 class Demo():
     def __init__(self):
         self.hinter = Hinter()
-        self.testers = [
-            GyroPongTester(),
-            DimmingTester(),
-            NeoPixelTester(),
-            AnyMeterTester(),
-            JoystickTester(),
-        ]
+        self.testers = TESTERS
         self.selected_tester = self.testers[0]
+        self.tester = None
         self.tester_index = 0
+        self.events = ButtonEvents()
         
-    def select_tester(self, tester: Tester):
-        self.hinter.clear()
-        if self.selected_tester is not None:
-            self.selected_tester.stop()
+    def select_tester(self, tester: TesterEntry):
         self.selected_tester = tester
         self.hinter.drawModules(self.selected_tester.config)
+        self.hinter.prefetch(self.next_tester().config)
+
+    def next_tester(self):
+        return self.testers[(self.tester_index + 1) % len(self.testers)]
         
     def cancel_handler(self, pin):
-        self.selected_tester.cancel_handler(pin)
+        if self.tester is not None:
+            self.tester.cancel_handler(pin)
         pin.irq(handler=None)  # Disable the cancel handler
 
     def start_selected_tester(self):
@@ -42,17 +38,40 @@ class Demo():
             print("No tester selected")
             return
         
+        # Hand the RAM held by prefetched images over to the tester
+        image_cache.clear()
         gc.collect()
-        self.hinter.tester_is_running(self.selected_tester.name)
-        select_button.irq(trigger=Pin.IRQ_RISING, handler=self.cancel_handler) 
+        entry = self.selected_tester
+        self.hinter.tester_is_running(entry.title)
+        failed = False
+        on_console = False
         try:
-            self.selected_tester.start()
+            self.tester = entry.load()
+            select_button.irq(trigger=Pin.IRQ_RISING, handler=self.cancel_handler) 
+            self.tester.start()
         except Exception as e:
             print("Error occurred: ", e)
             self.hinter.show_error(str(e))
+            failed = True
+        if self.tester is not None:
+            on_console = self.tester.report_to_console
+            self.tester.stop()
+            self.tester = None
+        # Drop the tester code until it is started again
+        entry.unload()
+        # Re-arm navigation and forget presses made while the tester ran
+        self.events.attach(select_button, SELECT)
+        self.events.clear()
+        self.events.report()
+        if not failed:
+            if on_console:
+                # Keep the report on screen until it has been read
+                display.print("Press any button")
+                self.events.wait()
+            self.hinter.drawModules(entry.config)
 
     def draw_startup(self):
-        display.draw_logo(y=90)
+        display.draw_logo(y=90, cache=LOGO_CACHE)
         display.fill_rect(100, 300, 140, 20, display.WHITE)
         arrow_polygon_nodes = [(10, 285) ,(10, 310), (35, 310), (27, 302), (43, 286), (34, 277), (18, 293), (10, 285)]
             
@@ -68,21 +87,24 @@ class Demo():
     def rotate_tester(self):
         self.tester_index = (self.tester_index + 1) % len(self.testers)
         self.select_tester(self.testers[self.tester_index])
-        while select_button.value() == 1: pass
 
     def run(self):
         print("Demo started")
+        self.events.attach(start_button, START)
+        self.events.attach(select_button, SELECT)
         self.draw_startup()
 
-        while select_button.value() == 0 and start_button.value() == 0:
-            pass
+        # Any button leaves the startup screen, the core sleeps while waiting
+        self.hinter.prefetch(self.selected_tester.config)
+        self.events.wait(self.hinter.idle)
 
         self.select_tester(self.selected_tester)
 
         while True:
-            if select_button.value() == 1:
+            event = self.events.wait(self.hinter.idle)
+            if event == SELECT:
                 self.rotate_tester()
-                
-            if start_button.value() == 1:
+            elif event == START:
                 self.start_selected_tester()
+                self.hinter.prefetch(self.next_tester().config)
                 
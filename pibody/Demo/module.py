@@ -1,4 +1,4 @@
-from machine import Pin, I2C, SoftI2C, PWM, ADC
+from machine import Pin, PWM, ADC
 png_path = "pibody/Demo/module_pngs/"
 
 
@@ -51,14 +51,16 @@ class Module():
         if self.bus is None:
             raise ValueError(f"Slot does not have a bus defined.")
         
-        if self.I2C is not None:
-            self.I2C = I2C(self.bus, scl=Pin(self.scl), sda=Pin(self.sda))
+        if self.I2C is None:
+            from pibody.helper import get_i2c_bus
+            self.I2C = get_i2c_bus((self.sda, self.scl), hard_i2c=True)
         
         return self.I2C
         
     def getSoftI2C(self):
-        if self.SoftI2C is not None:
-            self.SoftI2C = SoftI2C(scl=Pin(self.scl), sda=Pin(self.sda))
+        if self.SoftI2C is None:
+            from pibody.helper import get_i2c_bus
+            self.SoftI2C = get_i2c_bus((self.sda, self.scl), hard_i2c=False)
         return self.SoftI2C
     
     def getSda(self):
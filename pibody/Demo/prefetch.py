@@ -0,0 +1,75 @@
+import gc
+from pibody.graphics.image import MemoryReader, draw
+
+
+class ImageCache:
+    """LRU of R565 images read ahead from the atlas so the next screen draws from RAM.
+
+    Loading stops at budget bytes of cached images and whenever it would
+    leave less than min_free bytes of heap.
+    """
+
+    def __init__(self, budget=40960, min_free=32768):
+        self.budget = budget
+        self.min_free = min_free
+        self.used = 0
+        # name -> R565 bytes, order holds names least recently used first
+        self._images = {}
+        self._order = []
+        self._queue = []
+
+    def __contains__(self, name):
+        return name in self._images
+
+    def _touch(self, name):
+        if self._order[-1] != name:
+            self._order.remove(name)
+            self._order.append(name)
+
+    def _evict(self):
+        name = self._order.pop(0)
+        self.used -= len(self._images.pop(name))
+
+    def load(self, atlas, name):
+        if name in self._images:
+            self._touch(name)
+            return True
+        if name not in atlas:
+            return False
+        size = atlas.index[name][1]
+        if size > self.budget:
+            return False
+        while self.used + size > self.budget:
+            self._evict()
+        gc.collect()
+        if gc.mem_free() - size < self.min_free:
+            return False
+        self._images[name] = atlas.read(name)
+        self._order.append(name)
+        self.used += size
+        return True
+
+    def draw(self, display, name, x, y):
+        data = self._images.get(name)
+        if data is None:
+            return False
+        self._touch(name)
+        draw(display, MemoryReader(data), x, y)
+        return True
+
+    def prefetch(self, names):
+        # Queue images for step(), replacing whatever was still queued
+        self._queue = [name for name in names if name not in self._images]
+
+    def step(self, atlas):
+        # Load one queued image, call this from idle loops. False when nothing is left
+        if not self._queue or not atlas:
+            return False
+        self.load(atlas, self._queue.pop(0))
+        return True
+
+    def clear(self):
+        self._images.clear()
+        self._order = []
+        self._queue = []
+        self.used = 0
@@ -0,0 +1,101 @@
+from array import array
+from time import ticks_us, ticks_diff
+
+# Bucket 0 counts 0 us, bucket i durations of 2**(i-1) .. 2**i - 1 us,
+# the last bucket everything from about half a second up
+BUCKETS = 20
+
+
+class Section:
+    """Timing of one named piece of a frame, as a log2 histogram of ticks_us.
+
+    Use it as a context manager. Recording is a few integer operations
+    into preallocated storage, so sections can stay in field builds.
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.histogram = array("L", [0] * BUCKETS)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+        self._start = 0
+
+    def __enter__(self):
+        self._start = ticks_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.add(ticks_diff(ticks_us(), self._start))
+
+    def add(self, us):
+        if not self.profiler.enabled:
+            return
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+        i = 0
+        while us and i < BUCKETS - 1:
+            us >>= 1
+            i += 1
+        self.histogram[i] += 1
+
+    def percentile(self, p):
+        # Upper bound in us of the bucket holding the p-th percentile, at most max_us
+        if not self.count:
+            return 0
+        rank = (self.count * p + 99) // 100
+        seen = 0
+        for i in range(BUCKETS):
+            seen += self.histogram[i]
+            if seen >= rank:
+                return min((1 << i) - 1, self.max_us) if i < BUCKETS - 1 else self.max_us
+        return self.max_us
+
+    def reset(self):
+        for i in range(BUCKETS):
+            self.histogram[i] = 0
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+
+class Profiler:
+    """Named sections timed with ``with profiler.section(name):`` or ``@profiler(name)``."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.sections = {}
+
+    def section(self, name):
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+        return section
+
+    def __call__(self, name=None):
+        # Decorator timing every call of a plain (not async) function
+        def decorate(func):
+            section = self.section(name or func.__name__)
+
+            def wrapper(*args, **kwargs):
+                start = ticks_us()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    section.add(ticks_diff(ticks_us(), start))
+            return wrapper
+        return decorate
+
+    def reset(self):
+        for section in self.sections.values():
+            section.reset()
+
+    def dump(self, out=print):
+        # One line per section, the most expensive first
+        sections = [s for s in self.sections.values() if s.count]
+        for s in sorted(sections, key=lambda s: -s.total_us):
+            out("{}: {}x avg {} p50 {} p90 {} max {} us".format(
+                s.name, s.count, s.total_us // s.count, s.percentile(50), s.percentile(90), s.max_us))
@@ -0,0 +1,88 @@
+from .module import Module
+from .projectConfig import ProjectConfig
+import sys
+import gc
+
+PACKAGE = "pibody.Demo.Projects"
+
+
+class TesterEntry():
+    """A tester known by its module and class name, imported only when started.
+
+    The Demo screen only needs the config, so the tester code (and the
+    drivers it pulls in) stays out of RAM until load() and is dropped
+    again by unload().
+    """
+
+    def __init__(self, module, class_name, config: ProjectConfig):
+        self.module = module
+        self.class_name = class_name
+        self.config = config
+        self.title = config.getTitle()
+
+    def load(self):
+        name = PACKAGE + "." + self.module
+        mod = __import__(name, None, None, [self.class_name])
+        return getattr(mod, self.class_name)(self.config)
+
+    def unload(self):
+        name = PACKAGE + "." + self.module
+        if name in sys.modules:
+            del sys.modules[name]
+        package = sys.modules.get(PACKAGE)
+        if package is not None and hasattr(package, self.module):
+            delattr(package, self.module)
+        gc.collect()
+
+
+TESTERS = [
+    TesterEntry("gyropong_tester", "GyroPongTester", ProjectConfig(
+        title="GyroPong",
+        modules=[
+            Module(Module.LED_R, "A"),
+            Module(Module.LED_Y, "B"),
+            Module(Module.LED_G, "C"),
+            Module(Module.BUZZER, "D"),
+            Module(Module.GYRO_ACCEL, "E")
+        ]
+    )),
+    TesterEntry("dimming_tester", "DimmingTester", ProjectConfig(
+        title="Dimming System",
+        modules=[
+            Module(Module.LED_R, "A"),
+            Module(Module.MOTION_SENSOR, "B"),
+            Module(Module.LIGHT_SENSOR, "C")
+        ]
+    )),
+    TesterEntry("rgb_tester", "NeoPixelTester", ProjectConfig(
+        title="RGB Tester",
+        modules=[
+            Module(Module.BUTTON_BLUE, "A"),
+            Module(Module.BUTTON_YELLOW, "B"),
+            Module(Module.POTENTIOMETER, "C"),
+            Module(Module.ENCODER, "D"),
+            Module(Module.SWITCH, "E"),
+            Module(Module.TOUCH_SENSOR, "F")
+        ],
+        led_tower=True
+    )),
+    TesterEntry("any_meter_tester", "AnyMeterTester", ProjectConfig(
+        title="Any Meter",
+        modules=[
+            Module(Module.CLIMATE_SENSOR, "A"),
+            Module(Module.COLOR_SENSOR, "B"),
+            Module(Module.SOUND_SENSOR, "C"),
+            Module(Module.TOUCH_SENSOR, "D"),
+            Module(Module.DISTANCE_SENSOR, "E")
+        ],
+        led_tower=True
+    )),
+    TesterEntry("joystick_tester", "JoystickTester", ProjectConfig(
+        title="Joystick",
+        modules=[
+            Module(Module.JOYSTICK, "F")
+        ],
+        servo8=True,
+        servo9=True
+    )),
+]
@@ -1,14 +1,31 @@
 from .projectConfig import ProjectConfig
+from .profiler import Profiler
 from pibody import LEDTower
 from machine import PWM, Pin
 import gc
+import time
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 
 class Tester():
+    # Target loop() calls per second, None runs loop() back to back
+    rate = None
+    # Collect garbage when less heap than this is free...
+    GC_THRESHOLD = 16384
+    # ...or when at least this much of the frame is left over
+    GC_SLACK_US = 5000
+    # Print the report to the display console instead of the REPL
+    report_to_console = False
+
     def __init__(self, project_config: ProjectConfig):
         self.config = project_config
         self.name = project_config.getTitle()
         self.isRunning = False
+        # Time parts of loop() with `with self.profiler.section("name"):`
+        self.profiler = Profiler()
 
     def loop(self):
         pass
@@ -33,9 +50,65 @@ class Tester():
         self.init()
         print(f"Starting tester: {self.name}")
         self.isRunning = True
+        self._reset_stats()
+        next_frame = time.ticks_us()
         while self.isRunning:
+            begin = time.ticks_us()
             self.loop()
-            gc.collect()
+            next_frame, slack = self._frame(begin, next_frame)
+            if slack > 0:
+                time.sleep_us(slack)
+        self.report()
+
+    def _reset_stats(self):
+        self.frames = 0
+        self.overruns = 0
+        self.dropped = 0
+        self.busy_us = 0
+        self.worst_us = 0
+        self.profiler.reset()
+
+    def _frame(self, begin, next_frame):
+        # Book a loop() call that started at begin and collect garbage if due.
+        # Returns the start of the next frame and the us left until then.
+        used = time.ticks_diff(time.ticks_us(), begin)
+        self.frames += 1
+        self.busy_us += used
+        if used > self.worst_us:
+            self.worst_us = used
+        if not self.rate:
+            self.collect(0)
+            return next_frame, 0
+        period = 1000000 // self.rate
+        next_frame = time.ticks_add(next_frame, period)
+        slack = time.ticks_diff(next_frame, time.ticks_us())
+        if slack < 0:
+            # Late: skip the frame slots that already passed
+            self.overruns += 1
+            missed = -slack // period
+            self.dropped += missed
+            next_frame = time.ticks_add(next_frame, missed * period)
+        self.collect(slack)
+        return next_frame, time.ticks_diff(next_frame, time.ticks_us())
+
+    def collect(self, slack):
+        if gc.mem_free() < self.GC_THRESHOLD or slack >= self.GC_SLACK_US:
+            with self.profiler.section("gc"):
+                gc.collect()
+
+    def report(self):
+        # Frame timing and the profiler sections, printed when the tester stops or is cancelled
+        if not self.frames:
+            return
+        out = print
+        if self.report_to_console:
+            from pibody import display
+            out = display.print
+        line = f"{self.name}: {self.frames} frames, avg {self.busy_us // self.frames} us, worst {self.worst_us} us"
+        if self.rate:
+            line += f" of {1000000 // self.rate} us budget, {self.overruns} overruns, {self.dropped} dropped"
+        out(line)
+        self.profiler.dump(out)
 
     def stop(self):
         self.led_tower = None
@@ -49,3 +122,54 @@ class Tester():
             return
         self.isRunning = False
         print("Test cancelled")
+
+
+
+class AsyncTester(Tester):
+    """Tester whose loop() is a coroutine.
+
+    The coroutines returned by tasks() run as asyncio tasks next to the
+    loop, and loop() can start more (fades, beeps) with spawn(), so the
+    work of one tester interleaves instead of blocking.
+    """
+
+    def tasks(self):
+        return ()
+
+    def spawn(self, coro):
+        # Start a task that is cancelled when the tester stops
+        self._tasks = [task for task in self._tasks if not task.done()]
+        task = asyncio.create_task(coro)
+        self._tasks.append(task)
+        return task
+
+    async def loop(self):
+        pass
+
+    def start(self):
+        self.init()
+        print(f"Starting tester: {self.name}")
+        self.isRunning = True
+        self._reset_stats()
+        asyncio.run(self._run())
+        self.report()
+
+    async def _run(self):
+        self._tasks = []
+        for coro in self.tasks():
+            self.spawn(coro)
+        next_frame = time.ticks_us()
+        try:
+            while self.isRunning:
+                begin = time.ticks_us()
+                await self.loop()
+                next_frame, slack = self._frame(begin, next_frame)
+                # Always yield so the other tasks get to run
+                await asyncio.sleep_ms(max(slack // 1000, 0))
+        finally:
+            for task in self._tasks:
+                if not task.done():
+                    task.cancel()
+            # Let the cancelled tasks run their cleanup
+            await asyncio.sleep_ms(0)
+            self._tasks = []
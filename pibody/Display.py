@@ -1,15 +1,141 @@
 from machine import Pin, SPI
 import st7789
-import vga2_8x16 as font_small
-import vga2_10x20 as font_medium
-import vga2_12x24 as font_large
-import vga2_16x32 as font_bold 
 import math
+import os
+
+# Font modules are imported the first time they are used
+_FONT_MODULES = {
+    "font_small": "vga2_8x16",
+    "font_medium": "vga2_10x20",
+    "font_large": "vga2_12x24",
+    "font_bold": "vga2_16x32",
+}
+_fonts = {}
+
+
+# Packed fonts are read glyph by glyph from flash instead of importing the module
+FONT_DIR = "pibody/fonts"
+
+
+def _load_font(name):
+    font = _fonts.get(name)
+    if font is None:
+        module = _FONT_MODULES[name]
+        path = FONT_DIR + "/" + module + ".pbf"
+        try:
+            os.stat(path)
+        except OSError:
+            font = __import__(module)
+        else:
+            from .graphics.flashfont import FlashFont
+            font = FlashFont(path)
+        _fonts[name] = font
+    return font
+
+# Fixed-point scale for the arc boundary directions
+_ARC_ONE = 4096
+_FAR = 1 << 30
+
+
+def _extents(r2, rows):
+    # Midpoint walk: largest dx with dx*dx + dy*dy <= r2 for each dy in range(rows), -1 if none
+    ext = []
+    x = rows
+    for dy in range(rows):
+        d = r2 - dy * dy
+        while x >= 0 and x * x > d:
+            x -= 1
+        ext.append(x)
+    return ext
+
+
+def _direction(angle):
+    a = math.pi / 180 * angle
+    return round(_ARC_ONE * math.cos(a)), round(_ARC_ONE * math.sin(a))
+
+
+def _interval(c, d):
+    # Integer dx range satisfying c * dx <= d
+    if c > 0:
+        return -_FAR, d // c
+    if c < 0:
+        return -(d // -c), _FAR
+    return (-_FAR, _FAR) if d >= 0 else (_FAR, -_FAR)
+
+
+def _sin_bounds(start_angle, end_angle):
+    sweep = end_angle - start_angle
+    a = math.sin(math.pi / 180 * start_angle)
+    b = math.sin(math.pi / 180 * end_angle)
+    lo, hi = min(a, b), max(a, b)
+    if (90 - start_angle) % 360 <= sweep:
+        hi = 1
+    if (270 - start_angle) % 360 <= sweep:
+        lo = -1
+    return lo, hi
+
+
+def _arc_spans(center_x, center_y, r, width, start_angle, end_angle):
+    """Yield (x, y, length) horizontal spans covering the ring r..r+width-1 between two angles."""
+    sweep = end_angle - start_angle
+    if sweep <= 0 or width <= 0:
+        return
+    r_out = r + width - 1
+    outer = _extents(r_out * r_out + r_out, r_out + 1)
+    inner = _extents(r * r - r, r) if r > 0 else ()
+
+    top, bottom = -r_out, r_out
+    if sweep < 360:
+        ax, ay = _direction(start_angle)
+        bx, by = _direction(end_angle)
+        wide = sweep > 180
+        lo, hi = _sin_bounds(start_angle, end_angle)
+        top = max(top, math.floor((r_out if lo < 0 else r) * lo) - 1)
+        bottom = min(bottom, math.ceil((r_out if hi > 0 else r) * hi) + 1)
+
+    for dy in range(top, bottom + 1):
+        ady = abs(dy)
+        xo = outer[ady]
+        if xo < 0:
+            continue
+        xi = inner[ady] if ady < len(inner) else -1
+        if xi < 0:
+            spans = ((-xo, xo),)
+        else:
+            spans = ((-xo, -xi - 1), (xi + 1, xo))
+
+        if sweep >= 360:
+            for x0, x1 in spans:
+                yield center_x + x0, center_y + dy, x1 - x0 + 1
+        elif wide:
+            # Everything except the (convex) gap between end_angle and start_angle
+            lo1, hi1 = _interval(-ay, -ax * dy - 1)
+            lo2, hi2 = _interval(by, bx * dy - 1)
+            lo, hi = max(lo1, lo2), min(hi1, hi2)
+            for x0, x1 in spans:
+                if lo > hi or hi < x0 or lo > x1:
+                    yield center_x + x0, center_y + dy, x1 - x0 + 1
+                    continue
+                if lo > x0:
+                    yield center_x + x0, center_y + dy, lo - x0
+                if hi < x1:
+                    yield center_x + hi + 1, center_y + dy, x1 - hi
+        else:
+            lo1, hi1 = _interval(ay, ax * dy)
+            lo2, hi2 = _interval(-by, -bx * dy)
+            lo, hi = max(lo1, lo2, -xo), min(hi1, hi2, xo)
+            for x0, x1 in spans:
+                x0, x1 = max(x0, lo), min(x1, hi)
+                if x0 <= x1:
+                    yield center_x + x0, center_y + dy, x1 - x0 + 1
+
 
 class Display(st7789.ST7789):
     # Singleton instance
     _instance = None
 
+    POLYGON_CACHE_SIZE = 16
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(Display, cls).__new__(cls)
@@ -33,10 +159,6 @@ class Display(st7789.ST7789):
         self.display = self
         self.display.init()
 
-        self.font_small = font_small
-        self.font_medium = font_medium
-        self.font_large = font_large
-        self.font_bold = font_bold
         
         
         self.BLACK = st7789.BLACK
@@ -57,20 +179,208 @@ class Display(st7789.ST7789):
 
         self.vssa = 320 
 
+        # Last drawn state of incremental gauges, keyed by gauge position
+        self._gauges = {}
+        # Bumped whenever the screen is cleared, retained widgets then redraw from scratch
+        self._epoch = 0
+
+        # Off-screen target (e.g. a Canvas) that receives drawing calls instead of the panel
+        self._sink = None
+        self._canvas = None
+
+        self._console = None
+        self._labels = None
+
+        # Vertex lists of draw_polygon, keyed by its geometry arguments
+        self._polygons = {}
+
+        self._stats = None
+
     
-    def text(self, text, x, y, font=font_small, fg=st7789.WHITE, bg=st7789.BLACK):
-        super().text(font, text, x, y, fg, bg)
+    # Drawing primitives go to the attached sink first, then to the panel
+    # when the sink doesn't fully cover the call.
+
+    def text(self, text, x, y, font=None, fg=st7789.WHITE, bg=st7789.BLACK):
+        if font is None:
+            font = self.font_small
+        if self._sink is None or not self._sink.text(font, text, x, y, fg, bg):
+            if hasattr(font, "glyph"):
+                font.draw(self._blit, text, x, y, fg, bg)
+            else:
+                super().text(font, text, x, y, fg, bg)
+
+    def pixel(self, x, y, color):
+        if self._sink is None or not self._sink.pixel(x, y, color):
+            super().pixel(x, y, color)
+
+    def hline(self, x, y, length, color):
+        if self._sink is None or not self._sink.hline(x, y, length, color):
+            super().hline(x, y, length, color)
+
+    def vline(self, x, y, length, color):
+        if self._sink is None or not self._sink.vline(x, y, length, color):
+            super().vline(x, y, length, color)
+
+    def line(self, x0, y0, x1, y1, color):
+        if self._sink is None or not self._sink.line(x0, y0, x1, y1, color):
+            super().line(x0, y0, x1, y1, color)
+
+    def rect(self, x, y, w, h, color):
+        if self._sink is None or not self._sink.rect(x, y, w, h, color):
+            super().rect(x, y, w, h, color)
+
+    def fill_rect(self, x, y, w, h, color):
+        if self._sink is None or not self._sink.fill_rect(x, y, w, h, color):
+            super().fill_rect(x, y, w, h, color)
+
+    def polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        if self._sink is None or not self._sink.polygon(points, x, y, color, angle, center_x, center_y):
+            super().polygon(points, x, y, color, angle, center_x, center_y)
+
+    def fill_polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        if self._sink is None or not self._sink.fill_polygon(points, x, y, color, angle, center_x, center_y):
+            super().fill_polygon(points, x, y, color, angle, center_x, center_y)
+
+    def circle(self, x, y, r, color):
+        if self._sink is None or not self._sink.circle(x, y, r, color):
+            super().circle(x, y, r, color)
+
+    def fill_circle(self, x, y, r, color):
+        if self._sink is None or not self._sink.fill_circle(x, y, r, color):
+            super().fill_circle(x, y, r, color)
+
+    def blit_buffer(self, buffer, x, y, w, h):
+        if self._sink is None or not self._sink.blit_buffer(buffer, x, y, w, h):
+            super().blit_buffer(buffer, x, y, w, h)
+
+    def png(self, *args):
+        if self._sink is None or not self._sink.png(*args):
+            super().png(*args)
+
+    def _blit(self, buffer, x, y, w, h):
+        # Straight to the panel, used by sinks when flushing
+        super().blit_buffer(buffer, x, y, w, h)
+
+    def canvas(self, x=0, y=0, width=None, height=None):
+        # Route drawing into an RGB565 off-screen buffer covering the region; flush() shows it
+        from .graphics.canvas import Canvas
+        width = self.width - x if width is None else width
+        height = self.height - y if height is None else height
+        canvas = self._canvas
+        if canvas is None or (canvas.x, canvas.y, canvas.width, canvas.height) != (x, y, width, height):
+            self.end_canvas(free=True)
+            canvas = Canvas(x, y, width, height)
+            self._canvas = canvas
+        if self._sink is not canvas:
+            canvas.display = self
+            canvas.below = self._sink
+            self._sink = canvas
+        return canvas
+
+    def flush(self):
+        if self._canvas is not None:
+            self._canvas.flush()
+
+    async def flush_async(self, chunk=2048):
+        # Push the canvas in chunks of about chunk bytes, yielding to uasyncio in between.
+        # Await it, or wrap it in asyncio.create_task() to keep a handle that can be cancelled.
+        if self._canvas is not None:
+            await self._canvas.aflush(chunk)
+
+    def end_canvas(self, flush=True, free=False):
+        canvas = self._canvas
+        if canvas is None:
+            return
+        if flush:
+            canvas.flush()
+        if self._sink is canvas:
+            self._sink = canvas.below
+        if free:
+            self._canvas = None
+
+    def batch(self):
+        # Record drawing calls and submit them coalesced when the with-block ends
+        from .graphics.displaylist import DisplayList
+        return DisplayList(self)
+
+    @property
+    def font_small(self):
+        return _load_font("font_small")
+
+    @property
+    def font_medium(self):
+        return _load_font("font_medium")
+
+    @property
+    def font_large(self):
+        return _load_font("font_large")
+
+    @property
+    def font_bold(self):
+        return _load_font("font_bold")
+
+    @property
+    def labels(self):
+        if self._labels is None:
+            from .graphics.labels import LabelCache
+            self._labels = LabelCache()
+        return self._labels
+
+    def label(self, text, x, y, font=None, fg=st7789.WHITE, bg=st7789.BLACK):
+        # Same as text(), but the rendered pixels are cached and blitted on later calls
+        if font is None:
+            font = self.font_small
+        entry = self.labels.get(text, font, fg, bg)
+        if entry is None:
+            self.text(text, x, y, font, fg, bg)
+            return
+        buffer, w, h = entry
+        self.blit_buffer(buffer, x, y, w, h)
 
     def color(self, r, g, b):
         return st7789.color565(r, g, b)
 
+    def gradient(self, stops, steps=64, min_value=0, max_value=1):
+        # Lookup table mapping values to RGB565 colors and NeoPixel tuples
+        from .graphics.palette import Gradient
+        return Gradient(stops, steps, min_value, max_value)
+
     def draw_circle(self, color, center_x, center_y, r, width=1, start_angle=0, end_angle=360):
-        r2 = r + width
-        for r in range(r, r2):
-            for i in range(start_angle, end_angle):
-                dx = center_x + r * math.cos(math.pi/180*i)
-                dy = center_y + r * math.sin(math.pi/180*i)
-                self.display.pixel(round(dx), round(dy), color)
+        for x, y, length in _arc_spans(center_x, center_y, r, width, start_angle, end_angle):
+            self.hline(x, y, length, color)
+
+    def fill(self, color):
+        self._gauges.clear()
+        self._epoch += 1
+        if self._sink is None or not self._sink.fill(color):
+            super().fill(color)
+
+    def reset_gauges(self):
+        # Forget incremental gauge and widget state, e.g. after clearing part of the screen by hand
+        self._gauges.clear()
+        self._epoch += 1
+
+    def _gauge_state(self, key, style, value, incremental):
+        if not incremental:
+            self._gauges.pop(key, None)
+            return None
+        last = self._gauges.get(key)
+        self._gauges[key] = (style, value)
+        if last is not None and last[0] == style:
+            return last[1]
+        return None
+
+    def _bar_span(self, x0, x1, y, n, even, fill_color, background_color, line_color):
+        w = x1 - x0
+        if w <= 0:
+            return
+        if fill_color is not None:
+            self.fill_rect(x0, y - n, w, 2 * n + 1 + even, fill_color)
+            return
+        if n:
+            self.fill_rect(x0, y - n, w, n, background_color)
+            self.fill_rect(x0, y + 1 + even, w, n, background_color)
+        self.fill_rect(x0, y, w, 1 + even, line_color)
 
     def linear_bar(
             self, x, y, 
@@ -82,37 +392,64 @@ class Display(st7789.ST7789):
             border=False, 
             color=st7789.GREEN, 
             border_color=st7789.WHITE, 
-            background_color=st7789.BLACK):
+            background_color=st7789.BLACK,
+            incremental=False):
         even = 1 - height % 2
         n = int((height-1-even)/2)
-        
+        line_color = background_color if border else border_color
+
+        value = min(max(value - min_value, 0), max_value - min_value) / (max_value - min_value)
+        # Filled columns start at x, the interior spans x..x+length inclusive
+        filled = length + 1 if value >= 1 else math.floor(length * value)
+
+        style = (length, height, border, border_color, background_color)
+        last = self._gauge_state(("linear", x, y), style, (filled, color), incremental)
+        if last is not None:
+            old, old_color = last
+            if color != old_color:
+                self._bar_span(x, x + filled, y, n, even, color, background_color, line_color)
+            elif filled > old:
+                self._bar_span(x + old, x + filled, y, n, even, color, background_color, line_color)
+            if filled < old:
+                self._bar_span(x + filled, x + old, y, n, even, None, background_color, line_color)
+            return
+
         if border:
             self.rect(x-1, y-n-1, length+3, height+2, border_color)
-            line_color = background_color
         else:
             for i in range(2):
                 self.vline(x-1-i, y-n, height, border_color)
                 self.vline(x + length + 1 + i, y-n, height, border_color)
-            line_color = border_color
 
-        value = min(max(value - min_value, 0), max_value - min_value) / (max_value - min_value)
-
-        for i in range(height):
-            self.line(x, y - n + i, x + math.floor(length * value), y - n + i, color)
-        for i in range(n):
-            self.line(x + math.floor(length * value), y - 1 - i, x + length - 1, y - 1 - i, background_color)
-            self.line(x + math.floor(length * value), y + 1 + even + i, x + length - 1, y + 1 + even + i, background_color)
-        self.line(x + math.floor(length * value), y, x + length, y, line_color)
-        self.line(x + math.floor(length * value), y + even, x + length, y + even, line_color)
+        self._bar_span(x, x + filled, y, n, even, color, background_color, line_color)
+        self._bar_span(x + filled, x + length + 1, y, n, even, None, background_color, line_color)
 
-    def circular_bar(self, center_x, center_y, r, value, min_value, max_value, width=2, color=st7789.GREEN, background_color=st7789.WHITE):
+    def circular_bar(self, center_x, center_y, r, value, min_value, max_value, width=2, color=st7789.GREEN, background_color=st7789.WHITE, incremental=False):
         # Get angle from value
-        angle = min(max(value - min_value, 0), max_value - min_value) / (max_value - min_value) * 360
+        angle = int(min(max(value - min_value, 0), max_value - min_value) / (max_value - min_value) * 360)
+
+        style = (r, width, color, background_color)
+        old = self._gauge_state(("circular", center_x, center_y), style, angle, incremental)
+        if old is not None:
+            # Only the arc between the previous and the new angle changes
+            if angle > old:
+                self.draw_circle(color, center_x, center_y, r, width=width, start_angle=old-90, end_angle=angle-90)
+            elif angle < old:
+                self.draw_circle(background_color, center_x, center_y, r, width=width, start_angle=angle-90, end_angle=old-90)
+                # Both arcs include their boundary ray, give the one at angle back to the bar
+                self.draw_circle(color, center_x, center_y, r, width=width, start_angle=max(angle-91, -90), end_angle=angle-90)
+            return
+
         # Draw progress bar
-        self.draw_circle(background_color, center_x, center_y, r, width=width, start_angle=int(angle)-90, end_angle=270)
-        self.draw_circle(color, center_x, center_y, r, width=width, start_angle=-90, end_angle=int(angle)-90)
+        self.draw_circle(background_color, center_x, center_y, r, width=width, start_angle=angle-90, end_angle=270)
+        self.draw_circle(color, center_x, center_y, r, width=width, start_angle=-90, end_angle=angle-90)
+
+    def _polygon_points(self, center_x, center_y, r, n, bump, angle_offset):
+        key = (center_x, center_y, r, n, bump, angle_offset)
+        buf = self._polygons.get(key)
+        if buf is not None:
+            return buf
 
-    def draw_polygon(self, center_x, center_y, r, n, bump=1.0, angle_offset=None, color=st7789.WHITE, fill=False):
         buf = []
         angle = 0
         angle_step = 360 / n
@@ -134,47 +471,147 @@ class Display(st7789.ST7789):
             buf.append((round(dx), round(dy)))
             buf.append((round(bdx), round(bdy)))
 
+        if len(self._polygons) >= self.POLYGON_CACHE_SIZE:
+            self._polygons.clear()
+        self._polygons[key] = buf
+        return buf
+
+    def draw_polygon(self, center_x, center_y, r, n, bump=1.0, angle_offset=None, color=st7789.WHITE, fill=False):
+        buf = self._polygon_points(center_x, center_y, r, n, bump, angle_offset)
         if fill:
             self.fill_polygon(buf, 0, 0, color)
         else:
             self.polygon(buf, 0, 0, color)
 
-    def draw_logo(self, x=120, y=100, r=80):
-        super().fill(st7789.WHITE)
+    def _draw_logo(self, x, y, r):
+        self.fill(st7789.WHITE)
         self.draw_polygon(x, y, r, 8, bump=0.7, fill=True, color=st7789.BLACK)
         self.draw_polygon(x, y, r * 0.7, 4, bump=0.3, fill=True, color=st7789.WHITE, angle_offset=0)
-        self.text("Artisan", x - r, y + r, font=font_bold, fg=st7789.BLACK, bg=st7789.WHITE)
-        self.text("Education", x - r, y + r + 32, font=font_bold, fg=st7789.BLACK, bg=st7789.WHITE)
+        self.text("Artisan", x - r, y + r, font=self.font_bold, fg=st7789.BLACK, bg=st7789.WHITE)
+        self.text("Education", x - r, y + r + 32, font=self.font_bold, fg=st7789.BLACK, bg=st7789.WHITE)
         self.text("artisan.education", 100, 300, fg=st7789.BLACK, bg=st7789.WHITE)
-    
 
+    def draw_logo(self, x=120, y=100, r=80, cache=None):
+        # With a cache path the logo is rendered once into a R565 file and streamed from flash afterwards
+        if cache is not None:
+            try:
+                # The logo covers the whole screen like fill() would
+                self.reset_gauges()
+                self.image(cache, 0, 0)
+                return
+            except (OSError, ValueError):
+                pass
+        self._draw_logo(x, y, r)
+        if cache is not None:
+            self.render_to_file(cache, self._draw_logo, x, y, r)
 
-    def print(self, *args, font=font_medium):
-        max_chars = self.width // font.WIDTH
-        msg = (">> " + " ".join(str(a) for a in args))
-        
-        line = ""
-        for char in msg:
-            if char == '\n' or len(line) >= max_chars:
-                self._print_line(line, font)
-                line = "" if char == '\n' else char
-            else:
-                line += char
-            
-        if line:
-            self._print_line(line, font)
+    def image(self, path, x, y):
+        # Stream a R565 image file (see graphics/image.py) to the screen
+        from .graphics import image
+        with open(path, "rb") as f:
+            return image.draw(self, f, x, y)
+
+    async def image_async(self, path, x, y, rows=8):
+        # Same as image(), yielding to uasyncio every few rows
+        from .graphics import image
+        with open(path, "rb") as f:
+            return await image.draw_async(self, f, x, y, rows)
+
+    def render_to_file(self, path, draw, *args, rows=16):
+        # Render a full-screen drawing off-screen in strips of rows and save it as a R565 image
+        from .graphics.canvas import Canvas
+        from .graphics import image
+        sink = self._sink
+        strip = Canvas(0, 0, self.width, rows)
+        strip.display = self
+        strip.clip = True
+        try:
+            # Written under a temporary name so an interrupted save never leaves a broken image
+            with open(path + ".tmp", "wb") as f:
+                f.write(image.header(self.width, self.height))
+                for top in range(0, self.height, rows):
+                    strip.y = top
+                    strip.dirty = []
+                    self._sink = strip
+                    draw(*args)
+                    self._sink = sink
+                    image.save_canvas(strip, f.write, min(rows, self.height - top))
+            os.rename(path + ".tmp", path)
+        except OSError as e:
+            print("Could not write {}: {}".format(path, e))
+        finally:
+            self._sink = sink
+
+    def instrument(self, enable=True):
+        # Count calls, pixels, estimated SPI bytes and ticks_us per drawing method.
+        # Disabled, the plain methods run without any wrapper in between.
+        if enable and self._stats is None:
+            from .graphics.stats import DisplayStats
+            self._stats = DisplayStats(self)
+            self._stats.install()
+        elif not enable and self._stats is not None:
+            self._stats.uninstall()
+            self._stats = None
+        display._unbind()
+
+    def stats(self):
+        # {method: (calls, pixels, spi_bytes, us)}
+        return self._stats.report() if self._stats is not None else {}
+
+    def reset_stats(self):
+        if self._stats is not None:
+            self._stats.reset()
+
+    @property
+    def console(self):
+        if self._console is None:
+            from .graphics.console import Console
+            self._console = Console(self, self.font_medium)
+        return self._console
+
+    def chart(self, top, height, min_value, max_value, colors=(0xFFE0,), samples_per_row=1, bg=0):
+        # Strip chart scrolling rows top..top+height, use as a context manager or open()/close()
+        from .graphics.chart import StripChart
+        return StripChart(self, top, height, min_value, max_value, colors, samples_per_row, bg)
+
+    def sprites(self, background=0):
+        # Sprite layer over a solid color or a Canvas holding the background
+        from .graphics.sprite import SpriteLayer
+        return SpriteLayer(self, background)
+
+    def print(self, *args, font=None):
+        self.console.print(*args, font=self.font_medium if font is None else font)
+
+
+class _LazyDisplay:
+    # Stands in for the Display singleton so importing this module doesn't touch the panel.
+    # The display is set up on first use; methods are then bound directly on the proxy.
+
+    def __init__(self):
+        self._bound = []
+
+    def __getattr__(self, name):
+        value = getattr(Display._instance or Display(), name)
+        if callable(value):
+            object.__setattr__(self, name, value)
+            self._bound.append(name)
+        return value
+
+    def __setattr__(self, name, value):
+        # Assignments such as display.vssa = 320 go to the display itself
+        if name == "_bound":
+            object.__setattr__(self, name, value)
+            return
+        if name in self._bound:
+            delattr(self, name)
+            self._bound.remove(name)
+        setattr(Display._instance or Display(), name, value)
+
+    def _unbind(self):
+        # Drop cached bound methods, e.g. after methods were wrapped on the instance
+        for name in self._bound:
+            delattr(self, name)
+        self._bound = []
 
-    
-    def _print_line(self, msg, font):
-        line_height = font.HEIGHT
-        self.vssa -= line_height
-        if self.vssa < 0:
-            self.vssa = self.height - line_height
-        self.vscsad(self.vssa)
-        y = self.height - line_height - self.vssa
-        self.fill_rect(0, y, 240, line_height, 0)  
-        self.text(msg, 0, y, font=font)
-        
-    
 
-display = Display()
\ No newline at end of file
+display = _LazyDisplay()
\ No newline at end of file
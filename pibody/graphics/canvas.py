@@ -0,0 +1,265 @@
+import framebuf
+from array import array
+import math
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+_FAR = 1 << 30
+
+
+def swap(color):
+    # The panel expects big-endian RGB565, framebuf writes native (little-endian) words
+    return ((color & 0xFF) << 8) | (color >> 8)
+
+
+def render_text(fb, font, text, x, y, fg, bg, palette):
+    """Draw text with a st7789 bitmap font into a RGB565 FrameBuffer. Colors are already swapped."""
+    palette.pixel(0, 0, bg)
+    palette.pixel(1, 0, fg)
+    width = font.WIDTH
+    height = font.HEIGHT
+    size = ((width + 7) // 8) * height
+    first = font.FIRST
+    last = font.LAST
+    buf = bytearray(size)
+    glyph = framebuf.FrameBuffer(buf, width, height, framebuf.MONO_HLSB)
+    # Packed flash fonts hand out glyphs one by one, font modules keep them all in FONT
+    read = getattr(font, "glyph", None)
+    data = memoryview(font.FONT) if read is None else None
+    for char in text:
+        code = ord(char)
+        if first <= code <= last:
+            if read is None:
+                offset = (code - first) * size
+                buf[:] = data[offset:offset + size]
+            else:
+                buf[:] = read(code)
+            fb.blit(glyph, x, y, -1, palette)
+            x += width
+    return x
+
+
+class Canvas:
+    """RGB565 off-screen buffer for a region of the display.
+
+    Drawing calls land in RAM and mark dirty rectangles, flush() pushes
+    only the merged dirty regions to the panel with blit_buffer.
+    """
+    MAX_DIRTY = 8
+    SCRATCH_SIZE = 4096
+
+    def __init__(self, x=0, y=0, width=240, height=320):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(width * height * 2)
+        self.fb = framebuf.FrameBuffer(self.buffer, width, height, framebuf.RGB565)
+        self.dirty = []
+        self.display = None
+        self.below = None
+        # When set, drawing outside the region is dropped instead of reaching the panel
+        self.clip = False
+        self._palette = framebuf.FrameBuffer(bytearray(4), 2, 1, framebuf.RGB565)
+        self._scratch = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.display is not None:
+            self.display.end_canvas()
+
+    def mark(self, x0, y0, x1, y1):
+        # Merge the local rectangle [x0, x1) x [y0, y1) into the dirty list
+        rects = self.dirty
+        i = 0
+        while i < len(rects):
+            a0, b0, a1, b1 = rects[i]
+            if a0 <= x0 and b0 <= y0 and x1 <= a1 and y1 <= b1:
+                return
+            if a0 <= x1 and x0 <= a1 and b0 <= y1 and y0 <= b1:
+                rects.pop(i)
+                x0, y0 = min(x0, a0), min(y0, b0)
+                x1, y1 = max(x1, a1), max(y1, b1)
+                i = 0
+            else:
+                i += 1
+        rects.append((x0, y0, x1, y1))
+        if len(rects) > self.MAX_DIRTY:
+            self.dirty = [(
+                min(r[0] for r in rects), min(r[1] for r in rects),
+                max(r[2] for r in rects), max(r[3] for r in rects))]
+
+    def _touch(self, x, y, w, h):
+        # Mark the clipped box dirty; None when it misses the canvas, else whether it fits entirely
+        x0 = x - self.x
+        y0 = y - self.y
+        x1 = x0 + w
+        y1 = y0 + h
+        inside = x0 >= 0 and y0 >= 0 and x1 <= self.width and y1 <= self.height
+        if not inside:
+            x0, y0 = max(x0, 0), max(y0, 0)
+            x1, y1 = min(x1, self.width), min(y1, self.height)
+            if x0 >= x1 or y0 >= y1:
+                return None
+        self.mark(x0, y0, x1, y1)
+        return inside
+
+    # Drawing primitives, same arguments as st7789.ST7789. Each returns True
+    # when the call is fully handled, False when the panel must draw it too.
+
+    def pixel(self, x, y, color):
+        inside = self._touch(x, y, 1, 1)
+        if inside is not None:
+            self.fb.pixel(x - self.x, y - self.y, swap(color))
+        return inside or self.clip
+
+    def hline(self, x, y, length, color):
+        inside = self._touch(x, y, length, 1)
+        if inside is not None:
+            self.fb.hline(x - self.x, y - self.y, length, swap(color))
+        return inside or self.clip
+
+    def vline(self, x, y, length, color):
+        inside = self._touch(x, y, 1, length)
+        if inside is not None:
+            self.fb.vline(x - self.x, y - self.y, length, swap(color))
+        return inside or self.clip
+
+    def line(self, x0, y0, x1, y1, color):
+        inside = self._touch(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+        if inside is not None:
+            self.fb.line(x0 - self.x, y0 - self.y, x1 - self.x, y1 - self.y, swap(color))
+        return inside or self.clip
+
+    def rect(self, x, y, w, h, color):
+        inside = self._touch(x, y, w, h)
+        if inside is not None:
+            self.fb.rect(x - self.x, y - self.y, w, h, swap(color))
+        return inside or self.clip
+
+    def fill_rect(self, x, y, w, h, color):
+        inside = self._touch(x, y, w, h)
+        if inside is not None:
+            self.fb.fill_rect(x - self.x, y - self.y, w, h, swap(color))
+        return inside or self.clip
+
+    def fill(self, color):
+        self.fb.fill(swap(color))
+        self.mark(0, 0, self.width, self.height)
+        d = self.display
+        return self.clip or d is None or (self.x <= 0 and self.y <= 0 and
+            self.x + self.width >= d.width and self.y + self.height >= d.height)
+
+    def text(self, font, text, x, y, fg, bg):
+        inside = self._touch(x, y, len(text) * font.WIDTH, font.HEIGHT)
+        if inside is not None:
+            render_text(self.fb, font, text, x - self.x, y - self.y, swap(fg), swap(bg), self._palette)
+        return inside or self.clip
+
+    def _polygon(self, points, x, y, color, angle, center_x, center_y, fill):
+        coords = array("h")
+        if angle:
+            cos_a = math.cos(angle)
+            sin_a = math.sin(angle)
+        left = top = _FAR
+        right = bottom = -_FAR
+        for px, py in points:
+            if angle:
+                dx = px - center_x
+                dy = py - center_y
+                px = center_x + dx * cos_a - dy * sin_a
+                py = center_y + dx * sin_a + dy * cos_a
+            px = round(px)
+            py = round(py)
+            coords.append(px)
+            coords.append(py)
+            left, right = min(left, px), max(right, px)
+            top, bottom = min(top, py), max(bottom, py)
+        inside = self._touch(x + left, y + top, right - left + 1, bottom - top + 1)
+        if inside is not None:
+            self.fb.poly(x - self.x, y - self.y, coords, swap(color), fill)
+        return inside or self.clip
+
+    def polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        return self._polygon(points, x, y, color, angle, center_x, center_y, False)
+
+    def fill_polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        return self._polygon(points, x, y, color, angle, center_x, center_y, True)
+
+    def circle(self, x, y, r, color):
+        inside = self._touch(x - r, y - r, 2 * r + 1, 2 * r + 1)
+        if inside is not None:
+            self.fb.ellipse(x - self.x, y - self.y, r, r, swap(color))
+        return inside or self.clip
+
+    def fill_circle(self, x, y, r, color):
+        inside = self._touch(x - r, y - r, 2 * r + 1, 2 * r + 1)
+        if inside is not None:
+            self.fb.ellipse(x - self.x, y - self.y, r, r, swap(color), True)
+        return inside or self.clip
+
+    def blit_buffer(self, buffer, x, y, w, h):
+        inside = self._touch(x, y, w, h)
+        if inside is not None:
+            self.fb.blit(framebuf.FrameBuffer(buffer, w, h, framebuf.RGB565), x - self.x, y - self.y)
+        return inside or self.clip
+
+    def png(self, *args):
+        # PNG decoding only targets the panel, whatever lies under it in the canvas is kept
+        return self.clip
+
+    def chunks(self, x0, y0, x1, y1, limit=0):
+        """Yield (buffer, row, rows) pieces of a local rectangle ready for blit_buffer."""
+        stride = self.width * 2
+        w = (x1 - x0) * 2
+        limit = limit or len(self.buffer)
+        step = max(1, limit // w)
+        mv = memoryview(self.buffer)
+        if w == stride:
+            for row in range(y0, y1, step):
+                rows = min(step, y1 - row)
+                yield mv[row * stride:(row + rows) * stride], row, rows
+            return
+        if self._scratch is None:
+            self._scratch = bytearray(self.SCRATCH_SIZE)
+        scratch = memoryview(self._scratch)
+        step = max(1, min(step, len(scratch) // w))
+        for row in range(y0, y1, step):
+            rows = min(step, y1 - row)
+            for i in range(rows):
+                start = (row + i) * stride + x0 * 2
+                scratch[i * w:(i + 1) * w] = mv[start:start + w]
+            yield scratch[:rows * w], row, rows
+
+    def flush(self):
+        rects = self.dirty
+        self.dirty = []
+        blit = self.display._blit
+        for x0, y0, x1, y1 in rects:
+            for buf, row, rows in self.chunks(x0, y0, x1, y1):
+                blit(buf, self.x + x0, self.y + row, x1 - x0, rows)
+
+    async def aflush(self, chunk=2048):
+        """Push the dirty regions in chunks of about chunk bytes, yielding to the event loop in between.
+
+        If the task is cancelled, the rows not sent yet stay dirty for the next flush.
+        """
+        rects = self.dirty
+        self.dirty = []
+        blit = self.display._blit
+        try:
+            while rects:
+                x0, y0, x1, y1 = rects[0]
+                for buf, row, rows in self.chunks(x0, y0, x1, y1, chunk):
+                    blit(buf, self.x + x0, self.y + row, x1 - x0, rows)
+                    rects[0] = (x0, row + rows, x1, y1)
+                    await asyncio.sleep(0)
+                rects.pop(0)
+        finally:
+            for x0, y0, x1, y1 in rects:
+                if y0 < y1:
+                    self.mark(x0, y0, x1, y1)
@@ -0,0 +1,114 @@
+class StripChart:
+    """Scrolling strip chart on a hardware vertical-scroll band of the panel.
+
+    Rows top..top+height of the screen scroll as one band (vscrdef). Every
+    row holds one time step: the newest row is drawn at the bottom of the
+    band and vscsad moves the older ones up, so a sample costs one row of
+    pixels whatever the chart height. Values run along the x axis.
+
+    When samples come in faster than rows should scroll, samples_per_row
+    folds several samples into one row drawn as a min..max span.
+    """
+
+    def __init__(self, display, top, height, min_value, max_value, colors, samples_per_row=1, bg=0):
+        self.display = display
+        self.top = top
+        self.height = height
+        self.min_value = min_value
+        self.max_value = max_value
+        self.colors = colors
+        self.samples_per_row = samples_per_row
+        self.bg = bg
+        self.width = display.width
+        n = len(colors)
+        # Per trace: x drawn on the previous row, x of the latest sample, min and max x of the pending row
+        self._prev = [-1] * n
+        self._last = [0] * n
+        self._low = [0] * n
+        self._high = [0] * n
+        self._pending = 0
+        self._row = top + height - 1
+        self._vssa = display.vssa
+        self._open = False
+
+    def open(self):
+        d = self.display
+        d.fill_rect(0, self.top, self.width, self.height, self.bg)
+        # Scroll areas are given in panel memory order, which runs bottom-up with the default rotation
+        d.vscrdef(d.height - self.top - self.height, self.height, self.top)
+        self._vssa = d.vssa
+        self._row = self.top + self.height - 1
+        self._scroll()
+        for i in range(len(self._prev)):
+            self._prev[i] = -1
+        self._pending = 0
+        self._open = True
+        return self
+
+    def close(self, clear=True):
+        if not self._open:
+            return
+        self._open = False
+        d = self.display
+        d.vscrdef(0, d.height, 0)
+        d.vssa = self._vssa
+        # A fresh display holds vssa = height, the panel only takes 0..height-1
+        d.vscsad(d.vssa % d.height)
+        if clear:
+            d.fill_rect(0, self.top, self.width, self.height, self.bg)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _x(self, value):
+        span = self.max_value - self.min_value
+        x = int((value - self.min_value) * (self.width - 1) / span)
+        return min(max(x, 0), self.width - 1)
+
+    def add(self, *values):
+        """Add one sample per trace, in the order of colors."""
+        first = self._pending == 0
+        last = self._last
+        low = self._low
+        high = self._high
+        for i in range(len(values)):
+            x = self._x(values[i])
+            last[i] = x
+            if first or x < low[i]:
+                low[i] = x
+            if first or x > high[i]:
+                high[i] = x
+        self._pending += 1
+        if self._pending >= self.samples_per_row:
+            self._draw_row()
+
+    def _draw_row(self):
+        if not self._open:
+            self.open()
+        self._pending = 0
+        self._row += 1
+        if self._row >= self.top + self.height:
+            self._row = self.top
+        d = self.display
+        y = self._row
+        d.hline(0, y, self.width, self.bg)
+        prev = self._prev
+        for i in range(len(prev)):
+            a = self._low[i]
+            b = self._high[i]
+            # Join the trace to where it was on the previous row
+            if prev[i] >= 0:
+                a = min(a, prev[i])
+                b = max(b, prev[i])
+            d.hline(a, y, b - a + 1, self.colors[i])
+            prev[i] = self._last[i]
+        self._scroll()
+
+    def _scroll(self):
+        # Show the newest row at the bottom of the band
+        d = self.display
+        d.vssa = d.height - 1 - self._row
+        d.vscsad(d.vssa)
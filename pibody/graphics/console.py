@@ -0,0 +1,126 @@
+class Console:
+    """Scroll-back text console on top of the panel's hardware vertical scroll.
+
+    Wrapped lines are kept in a fixed-size ring buffer. Each render scrolls
+    the panel once (vscsad) and draws only the line slots that changed, so
+    a burst of prints inside ``with display.console:`` costs a single pass.
+    """
+    PROMPT = ">> "
+
+    def __init__(self, display, font, history=64):
+        self.display = display
+        self.history = [""] * history
+        self.count = 0
+        self.offset = 0
+        self.fg = 0xFFFF
+        self.bg = 0
+        self._hold = 0
+        self._set_font(font)
+
+    def _set_font(self, font):
+        self.font = font
+        self.line_height = font.HEIGHT
+        self.max_chars = self.display.width // font.WIDTH
+        self.slots = self.display.height // font.HEIGHT
+        # Memory slot of the bottom visible line and the history index drawn there
+        self.slot = -1
+        self.bottom = -1
+
+    def __enter__(self):
+        self._hold += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._hold -= 1
+        if self._hold == 0:
+            self.render()
+
+    def print(self, *args, font=None):
+        if font is not None and font is not self.font:
+            self._set_font(font)
+        self.write(self.PROMPT + " ".join(str(a) for a in args))
+
+    def write(self, msg):
+        step = self.max_chars
+        parts = msg.split("\n")
+        last = len(parts) - 1
+        added = 0
+        for n, part in enumerate(parts):
+            if not part:
+                if n < last:
+                    self._append("")
+                    added += 1
+                continue
+            for i in range(0, len(part), step):
+                self._append(part[i:i + step])
+                added += 1
+        if self.offset:
+            # Keep a scrolled-back view where it is
+            self.offset = min(self.offset + added, self.max_offset())
+        if not self._hold:
+            self.render()
+
+    def _append(self, line):
+        self.history[self.count % len(self.history)] = line
+        self.count += 1
+
+    def max_offset(self):
+        return max(min(self.count, len(self.history)) - self.slots, 0)
+
+    def scroll(self, lines):
+        # Positive values move back through the history, negative values towards the newest line
+        self.offset = min(max(self.offset + lines, 0), self.max_offset())
+        self.render()
+
+    def follow(self):
+        self.offset = 0
+        self.render()
+
+    def clear(self):
+        self.reset()
+        self.display.fill_rect(0, 0, self.display.width, self.display.height, self.bg)
+
+    def reset(self):
+        # Forget the lines and scroll the panel back to its home position
+        self.count = 0
+        self.offset = 0
+        d = self.display
+        # vssa = height is the value print() counts down from, the panel's home is 0
+        d.vssa = d.height
+        d.vscsad(0)
+        self._set_font(self.font)
+
+    def render(self):
+        target = self.count - 1 - self.offset
+        k = target - self.bottom
+        if k == 0:
+            return
+        slots = self.slots
+        self.slot = (self.slot + k) % slots
+        self.bottom = target
+        if k >= slots or k <= -slots:
+            first, last = target - slots + 1, target
+        elif k > 0:
+            first, last = target - k + 1, target
+        else:
+            # Scrolled back: the lines entering at the top
+            first, last = target - slots + 1, target - slots - k
+
+        d = self.display
+        d.vssa = d.height - self.line_height - self.slot * self.line_height
+        d.vscsad(d.vssa)
+        for i in range(first, last + 1):
+            self._draw(i, (self.slot - (target - i)) % slots)
+
+    def _draw(self, index, slot):
+        if 0 <= index and self.count - len(self.history) <= index:
+            line = self.history[index % len(self.history)]
+        else:
+            line = ""
+        d = self.display
+        y = slot * self.line_height
+        used = len(line) * self.font.WIDTH
+        if line:
+            d.text(line, 0, y, font=self.font, fg=self.fg, bg=self.bg)
+        if used < d.width:
+            d.fill_rect(used, y, d.width - used, self.line_height, self.bg)
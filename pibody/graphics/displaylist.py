@@ -0,0 +1,179 @@
+class DisplayList:
+    """Records drawing calls and replays them as one coalesced batch.
+
+    Solid primitives (pixels, lines along an axis, rects) become rectangles
+    that are merged with earlier rectangles of the same color when nothing
+    recorded in between overlaps them. On submit, calls that a later solid
+    call fully covers are dropped. Everything else is replayed in order.
+
+        with display.batch():
+            display.linear_bar(...)
+            display.text(...)
+    """
+    # How far back a new rectangle may be merged into an earlier one
+    MERGE_WINDOW = 8
+    # How many later covering boxes each call is checked against on submit
+    COVER_WINDOW = 16
+
+    def __init__(self, display):
+        self.display = display
+        self.below = None
+        # Each op is [name, x, y, w, h, color, args, covers]; name is None for solid rects
+        # and bbox fields are None when the extent of a call is unknown
+        self.ops = []
+
+    def __enter__(self):
+        self.below = self.display._sink
+        self.display._sink = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.display._sink = self.below
+        if exc_type is None:
+            self.submit()
+        else:
+            self.ops = []
+
+    def __len__(self):
+        return len(self.ops)
+
+    def _rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return True
+        ops = self.ops
+        for j in range(len(ops) - 1, max(len(ops) - 1 - self.MERGE_WINDOW, -1), -1):
+            op = ops[j]
+            if op[0] is not None or op[5] != color:
+                continue
+            ox, oy, ow, oh = op[1], op[2], op[3], op[4]
+            if oy == y and oh == h and x <= ox + ow and ox <= x + w:
+                nx = min(ox, x)
+                merged = (nx, y, max(ox + ow, x + w) - nx, h)
+            elif ox == x and ow == w and y <= oy + oh and oy <= y + h:
+                ny = min(oy, y)
+                merged = (x, ny, w, max(oy + oh, y + h) - ny)
+            elif ox <= x and oy <= y and x + w <= ox + ow and y + h <= oy + oh:
+                merged = (ox, oy, ow, oh)
+            else:
+                continue
+            if self._clear_after(j, merged):
+                op[1], op[2], op[3], op[4] = merged
+                return True
+        ops.append([None, x, y, w, h, color, None, True])
+        return True
+
+    def _clear_after(self, j, box):
+        # True when nothing recorded after ops[j] overlaps box
+        x, y, w, h = box
+        for op in self.ops[j + 1:]:
+            if op[1] is None:
+                return False
+            if op[1] < x + w and x < op[1] + op[3] and op[2] < y + h and y < op[2] + op[4]:
+                return False
+        return True
+
+    def _call(self, name, args, box=None, covers=False):
+        if box is None:
+            self.ops.append([name, None, None, None, None, None, args, False])
+        else:
+            self.ops.append([name, box[0], box[1], box[2], box[3], None, args, covers])
+        return True
+
+    def pixel(self, x, y, color):
+        return self._rect(x, y, 1, 1, color)
+
+    def hline(self, x, y, length, color):
+        return self._rect(x, y, length, 1, color)
+
+    def vline(self, x, y, length, color):
+        return self._rect(x, y, 1, length, color)
+
+    def line(self, x0, y0, x1, y1, color):
+        if y0 == y1:
+            return self._rect(min(x0, x1), y0, abs(x1 - x0) + 1, 1, color)
+        if x0 == x1:
+            return self._rect(x0, min(y0, y1), 1, abs(y1 - y0) + 1, color)
+        box = (min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+        return self._call("line", (x0, y0, x1, y1, color), box)
+
+    def rect(self, x, y, w, h, color):
+        self._rect(x, y, w, 1, color)
+        self._rect(x, y + h - 1, w, 1, color)
+        self._rect(x, y + 1, 1, h - 2, color)
+        return self._rect(x + w - 1, y + 1, 1, h - 2, color)
+
+    def fill_rect(self, x, y, w, h, color):
+        return self._rect(x, y, w, h, color)
+
+    def fill(self, color):
+        # Nothing recorded so far can show through a full-screen fill
+        self.ops = []
+        return self._rect(0, 0, self.display.width, self.display.height, color)
+
+    def text(self, font, text, x, y, fg, bg):
+        box = (x, y, len(text) * font.WIDTH, font.HEIGHT)
+        return self._call("text", (text, x, y, font, fg, bg), box, True)
+
+    def polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        return self._call("polygon", (points, x, y, color, angle, center_x, center_y))
+
+    def fill_polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        return self._call("fill_polygon", (points, x, y, color, angle, center_x, center_y))
+
+    def circle(self, x, y, r, color):
+        return self._call("circle", (x, y, r, color), (x - r, y - r, 2 * r + 1, 2 * r + 1))
+
+    def fill_circle(self, x, y, r, color):
+        return self._call("fill_circle", (x, y, r, color), (x - r, y - r, 2 * r + 1, 2 * r + 1))
+
+    def blit_buffer(self, buffer, x, y, w, h):
+        return self._call("blit_buffer", (buffer, x, y, w, h), (x, y, w, h), True)
+
+    def png(self, *args):
+        return self._call("png", args)
+
+    def _visible(self):
+        # Drop calls fully hidden by a later covering call
+        covers = []
+        keep = []
+        for op in reversed(self.ops):
+            x = op[1]
+            if x is not None:
+                y, w, h = op[2], op[3], op[4]
+                hidden = False
+                for cx, cy, cw, ch in covers:
+                    if cx <= x and cy <= y and x + w <= cx + cw and y + h <= cy + ch:
+                        hidden = True
+                        break
+                if hidden:
+                    continue
+                if op[7]:
+                    covers.append((x, y, w, h))
+                    if len(covers) > self.COVER_WINDOW:
+                        covers.pop(0)
+            keep.append(op)
+        keep.reverse()
+        return keep
+
+    def submit(self):
+        ops = self._visible()
+        self.ops = []
+        d = self.display
+        sink = d._sink
+        d._sink = self.below
+        try:
+            for op in ops:
+                name = op[0]
+                if name is None:
+                    x, y, w, h, color = op[1], op[2], op[3], op[4], op[5]
+                    if h == 1:
+                        d.hline(x, y, w, color)
+                    elif w == 1:
+                        d.vline(x, y, h, color)
+                    else:
+                        d.fill_rect(x, y, w, h, color)
+                else:
+                    getattr(d, name)(*op[6])
+        finally:
+            d._sink = sink
+        return len(ops)
@@ -0,0 +1,86 @@
+"""Bitmap fonts read glyph by glyph from a packed file instead of a resident module.
+
+File layout: b"PBF1", width, height, first, last (one byte each), then the
+glyphs from first to last in the st7789 bitmap font layout (rows of
+(width + 7) // 8 bytes, most significant bit first).
+
+pack() has no MicroPython-only imports so build scripts can use it on a
+desktop Python.
+"""
+MAGIC = b"PBF1"
+HEADER_SIZE = 8
+
+
+def pack(font, write):
+    """Write a st7789 bitmap font module (WIDTH, HEIGHT, FIRST, LAST, FONT) in the packed format."""
+    size = ((font.WIDTH + 7) // 8) * font.HEIGHT
+    count = font.LAST - font.FIRST + 1
+    write(MAGIC + bytes((font.WIDTH, font.HEIGHT, font.FIRST, font.LAST)))
+    write(bytes(font.FONT[:count * size]))
+
+
+class FlashFont:
+    """Font with the same WIDTH/HEIGHT/FIRST/LAST attributes as a font module.
+
+    Glyphs are read from the file when first drawn and the most recently
+    used ones are kept in a small LRU.
+    """
+
+    def __init__(self, path, cache_size=48):
+        self.path = path
+        self.cache_size = cache_size
+        self._file = open(path, "rb")
+        header = self._file.read(HEADER_SIZE)
+        if header[:4] != MAGIC:
+            raise ValueError("Not a packed font")
+        self.WIDTH, self.HEIGHT, self.FIRST, self.LAST = header[4], header[5], header[6], header[7]
+        self.size = ((self.WIDTH + 7) // 8) * self.HEIGHT
+        # code -> glyph bytes, order holds codes least recently used first
+        self._glyphs = {}
+        self._order = []
+        self._pixels = None
+
+    def glyph(self, code):
+        """Bitmap bytes of one character, None outside the font range."""
+        glyph = self._glyphs.get(code)
+        if glyph is not None:
+            if self._order[-1] != code:
+                self._order.remove(code)
+                self._order.append(code)
+            return glyph
+        if not self.FIRST <= code <= self.LAST:
+            return None
+        if len(self._order) >= self.cache_size:
+            del self._glyphs[self._order.pop(0)]
+        glyph = bytearray(self.size)
+        self._file.seek(HEADER_SIZE + (code - self.FIRST) * self.size)
+        self._file.readinto(glyph)
+        self._glyphs[code] = glyph
+        self._order.append(code)
+        return glyph
+
+    def draw(self, blit, text, x, y, fg, bg):
+        """Draw text with blit(buffer, x, y, w, h), one RGB565 glyph at a time."""
+        import framebuf
+        from .canvas import swap
+        w = self.WIDTH
+        h = self.HEIGHT
+        if self._pixels is None:
+            self._pixels = bytearray(w * h * 2)
+            self._fb = framebuf.FrameBuffer(self._pixels, w, h, framebuf.RGB565)
+            self._palette = framebuf.FrameBuffer(bytearray(4), 2, 1, framebuf.RGB565)
+        self._palette.pixel(0, 0, swap(bg))
+        self._palette.pixel(1, 0, swap(fg))
+        for char in text:
+            glyph = self.glyph(ord(char))
+            if glyph is None:
+                continue
+            self._fb.blit(framebuf.FrameBuffer(glyph, w, h, framebuf.MONO_HLSB), 0, 0, -1, self._palette)
+            blit(self._pixels, x, y, w, h)
+            x += w
+        return x
+
+    def close(self):
+        self._file.close()
+        self._glyphs.clear()
+        self._order = []
@@ -0,0 +1,221 @@
+"""R565 images: RGB565 pixels stored as row-wise runs, streamed to the display.
+
+File layout (all numbers big-endian):
+    b"R565", width (u16), height (u16)
+    ops, row by row, an op never crosses the end of a row:
+        u16 word: top 2 bits = kind, low 14 bits = pixel count
+        FILL  count pixels of one color, followed by the color (u16)
+        SKIP  count transparent pixels, nothing follows
+        RAW   count pixels follow as u16 colors
+
+This module has no MicroPython-only imports so the build scripts can use
+the encoder on a desktop Python.
+"""
+MAGIC = b"R565"
+HEADER_SIZE = 8
+
+FILL = 0
+SKIP = 1
+RAW = 2
+
+MAX_COUNT = 0x3FFF
+# Shorter runs of one color are cheaper to send as part of a RAW op
+MIN_FILL = 3
+
+
+def header(width, height):
+    return MAGIC + bytes((width >> 8, width & 0xFF, height >> 8, height & 0xFF))
+
+
+def read_header(data):
+    if bytes(data[:4]) != MAGIC:
+        raise ValueError("Not a R565 image")
+    return (data[4] << 8) | data[5], (data[6] << 8) | data[7]
+
+
+def _op(kind, count):
+    word = (kind << 14) | count
+    return bytes((word >> 8, word & 0xFF))
+
+
+def _color(color):
+    return bytes((color >> 8, color & 0xFF))
+
+
+def _run(write, kind, color, count):
+    while count:
+        n = min(count, MAX_COUNT)
+        write(_op(kind, n))
+        if kind == FILL:
+            write(_color(color))
+        count -= n
+
+
+def _raw(write, pixels, start, end):
+    while start < end:
+        n = min(end - start, MAX_COUNT)
+        write(_op(RAW, n))
+        write(b"".join(_color(c) for c in pixels[start:start + n]))
+        start += n
+
+
+def encode_row(pixels, write):
+    """Write the ops for one row. pixels holds RGB565 ints, None marks a transparent pixel."""
+    n = len(pixels)
+    i = 0
+    raw_start = 0
+    while i < n:
+        value = pixels[i]
+        j = i + 1
+        while j < n and pixels[j] == value:
+            j += 1
+        if value is None or j - i >= MIN_FILL:
+            _raw(write, pixels, raw_start, i)
+            _run(write, SKIP if value is None else FILL, value, j - i)
+            raw_start = j
+        i = j
+    _raw(write, pixels, raw_start, n)
+
+
+class MemoryReader:
+    """readinto() over a bytes-like object, so in-RAM images stream the same way as files."""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def readinto(self, buf):
+        # Like a file: copies what is left up to len(buf) and returns that count
+        n = min(len(buf), len(self.data) - self.pos)
+        buf[:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def read(self, n):
+        data = bytes(self.data[self.pos:self.pos + n])
+        self.pos += len(data)
+        return data
+
+
+def _rows(display, stream, x, y, width, height):
+    # Draw the ops row by row, yielding after each finished row
+    word = bytearray(2)
+    row = memoryview(bytearray(width * 2))
+    col = 0
+    line = 0
+    while line < height:
+        if stream.readinto(word) != 2:
+            raise ValueError("Truncated R565 image")
+        kind = word[0] >> 6
+        count = ((word[0] & 0x3F) << 8) | word[1]
+        if kind == FILL:
+            if stream.readinto(word) != 2:
+                raise ValueError("Truncated R565 image")
+            display.hline(x + col, y + line, count, (word[0] << 8) | word[1])
+        elif kind == RAW:
+            pixels = row[:count * 2]
+            if stream.readinto(pixels) != count * 2:
+                raise ValueError("Truncated R565 image")
+            display.blit_buffer(pixels, x + col, y + line, count, 1)
+        col += count
+        if col >= width:
+            col = 0
+            line += 1
+            yield line
+
+
+def draw(display, stream, x, y):
+    """Stream one R565 image from a file-like object to the display.
+
+    Only a word buffer and a single row buffer are allocated.
+    """
+    width, height = read_header(stream.read(HEADER_SIZE))
+    for _ in _rows(display, stream, x, y, width, height):
+        pass
+    return width, height
+
+
+async def draw_async(display, stream, x, y, rows=8):
+    """Same as draw(), but yields to the asyncio loop every few rows."""
+    try:
+        import asyncio
+    except ImportError:
+        import uasyncio as asyncio
+    width, height = read_header(stream.read(HEADER_SIZE))
+    for line in _rows(display, stream, x, y, width, height):
+        if line % rows == 0:
+            await asyncio.sleep(0)
+    return width, height
+
+
+def save_canvas(canvas, write, rows=None):
+    """Write the ops for the first rows of a canvas buffer (all rows by default)."""
+    buf = canvas.buffer
+    width = canvas.width
+    for row in range(canvas.height if rows is None else rows):
+        base = row * width * 2
+        encode_row([(buf[base + 2 * i] << 8) | buf[base + 2 * i + 1] for i in range(width)], write)
+
+
+ATLAS_MAGIC = b"RATL"
+
+
+def _u32(n):
+    return bytes((n >> 24, (n >> 16) & 0xFF, (n >> 8) & 0xFF, n & 0xFF))
+
+
+def write_atlas(images, write):
+    """Write several R565 images as one atlas file. images is a list of (name, R565 bytes).
+
+    Layout: b"RATL", count (u16), then per image: name length (u8), name,
+    offset (u32), size (u32), width (u16), height (u16); then the R565
+    images themselves, each starting at its offset.
+    """
+    offset = 6 + sum(13 + len(name) for name, _ in images)
+    write(ATLAS_MAGIC + bytes((len(images) >> 8, len(images) & 0xFF)))
+    for name, data in images:
+        name = name.encode()
+        write(bytes((len(name),)) + name + _u32(offset) + _u32(len(data)) + bytes(data[4:8]))
+        offset += len(data)
+    for _, data in images:
+        write(data)
+
+
+class Atlas:
+    """Images packed by write_atlas(), read from one file handle that stays open."""
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        head = self.file.read(6)
+        if head[:4] != ATLAS_MAGIC:
+            self.file.close()
+            raise ValueError("Not an image atlas")
+        # name -> (offset, size, width, height)
+        self.index = {}
+        for _ in range((head[4] << 8) | head[5]):
+            name = self.file.read(self.file.read(1)[0]).decode()
+            e = self.file.read(12)
+            self.index[name] = (
+                (e[0] << 24) | (e[1] << 16) | (e[2] << 8) | e[3],
+                (e[4] << 24) | (e[5] << 16) | (e[6] << 8) | e[7],
+                (e[8] << 8) | e[9],
+                (e[10] << 8) | e[11])
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def draw(self, display, name, x, y):
+        self.file.seek(self.index[name][0])
+        return draw(display, self.file, x, y)
+
+    def read(self, name):
+        # The whole R565 image, e.g. to keep it in RAM and draw it with MemoryReader
+        offset, size, _, _ = self.index[name]
+        self.file.seek(offset)
+        data = self.file.read(size)
+        if len(data) != size:
+            raise ValueError("Truncated atlas entry " + name)
+        return data
+
+    def close(self):
+        self.file.close()
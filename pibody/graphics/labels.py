@@ -0,0 +1,52 @@
+import framebuf
+from .canvas import render_text, swap
+
+
+class LabelCache:
+    """LRU of pre-rendered RGB565 text labels kept under a byte budget."""
+
+    def __init__(self, budget=12288):
+        self.budget = budget
+        self.used = 0
+        # (text, font, fg, bg) -> (buffer, width, height), order holds keys least recently used first
+        self._entries = {}
+        self._order = []
+        self._palette = framebuf.FrameBuffer(bytearray(4), 2, 1, framebuf.RGB565)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, text, font, fg, bg):
+        key = (text, font, fg, bg)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._order[-1] != key:
+                self._order.remove(key)
+                self._order.append(key)
+            return entry
+
+        width = len(text) * font.WIDTH
+        height = font.HEIGHT
+        size = width * height * 2
+        if size == 0 or size > self.budget:
+            return None
+        while self.used + size > self.budget:
+            self._evict()
+        buffer = bytearray(size)
+        fb = framebuf.FrameBuffer(buffer, width, height, framebuf.RGB565)
+        render_text(fb, font, text, 0, 0, swap(fg), swap(bg), self._palette)
+        entry = (buffer, width, height)
+        self._entries[key] = entry
+        self._order.append(key)
+        self.used += size
+        return entry
+
+    def _evict(self):
+        key = self._order.pop(0)
+        buffer = self._entries.pop(key)[0]
+        self.used -= len(buffer)
+
+    def clear(self):
+        self._entries.clear()
+        self._order = []
+        self.used = 0
@@ -0,0 +1,49 @@
+from array import array
+
+
+def color565(r, g, b):
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+class Gradient:
+    """Color ramp through evenly spaced (r, g, b) stops, precomputed into steps entries.
+
+    colors holds the RGB565 values for the display and tuples the matching
+    (r, g, b) tuples for NeoPixels, so looking a color up allocates nothing.
+    """
+
+    def __init__(self, stops, steps=64, min_value=0, max_value=1):
+        self.steps = steps
+        self.min_value = min_value
+        self.max_value = max_value
+        self.colors = array("H")
+        self.tuples = []
+        segments = len(stops) - 1
+        den = max(steps - 1, 1)
+        for i in range(steps):
+            # Position along the ramp in units of 1 / den, split into stop k and the rest
+            pos = i * segments
+            k = min(pos // den, segments - 1) if segments else 0
+            c0 = stops[k]
+            c1 = stops[k + 1] if segments else c0
+            num = pos - k * den
+            rgb = tuple(c0[j] + (c1[j] - c0[j]) * num // den for j in range(3))
+            self.colors.append(color565(*rgb))
+            self.tuples.append(rgb)
+
+    def index(self, value):
+        if value <= self.min_value:
+            return 0
+        if value >= self.max_value:
+            return self.steps - 1
+        return int((value - self.min_value) * (self.steps - 1) // (self.max_value - self.min_value))
+
+    def position(self, i, n):
+        # Index for item i of n spread over the whole ramp, e.g. LEDs of a bar
+        return i * (self.steps - 1) // max(n - 1, 1)
+
+    def color(self, value):
+        return self.colors[self.index(value)]
+
+    def neopixel(self, value):
+        return self.tuples[self.index(value)]
@@ -0,0 +1,172 @@
+import framebuf
+from .canvas import Canvas, swap
+
+
+class Sprite:
+    """A movable RGB565 image with one or more frames.
+
+    Draw each frame once into frames[i] (a Canvas, so the usual drawing
+    calls work with coordinates relative to the sprite). Pixels of the
+    key color are transparent.
+    """
+
+    def __init__(self, width, height, frames=1, key=None, x=0, y=0):
+        self.width = width
+        self.height = height
+        self.frames = [Canvas(0, 0, width, height) for _ in range(frames)]
+        self.key = key
+        self.x = x
+        self.y = y
+        self.frame = 0
+        self.visible = True
+        self.dirty = True
+        # Rectangle covered on the panel, None while not drawn
+        self.drawn = None
+        # Background saved under the sprite and the frame composed over it
+        self._under = None
+        self._composed = None
+        # Frames composed over a solid background, by frame index
+        self._cache = {}
+
+    def move(self, x, y):
+        if x != self.x or y != self.y:
+            self.x = x
+            self.y = y
+            self.dirty = True
+
+    def move_by(self, dx, dy):
+        self.move(self.x + dx, self.y + dy)
+
+    def show(self, frame):
+        if frame != self.frame:
+            self.frame = frame
+            self.dirty = True
+
+    def hide(self):
+        if self.visible:
+            self.visible = False
+            self.dirty = True
+
+    def unhide(self):
+        if not self.visible:
+            self.visible = True
+            self.dirty = True
+
+    def changed(self):
+        # Call after drawing into the current frame again
+        self.dirty = True
+        self._cache.clear()
+
+    def collides(self, other):
+        return (self.x < other.x + other.width and other.x < self.x + self.width and
+                self.y < other.y + other.height and other.y < self.y + self.height)
+
+    def _overlaps(self, rect):
+        x, y, w, h = rect
+        return (self.x < x + w and x < self.x + self.width and
+                self.y < y + h and y < self.y + self.height)
+
+
+class SpriteLayer:
+    """Sprites over a solid color or a Canvas holding the background.
+
+    The panel can't be read back, so the background under a sprite comes
+    from the background source. update() restores the rectangles sprites
+    moved away from and blits them at their new place, a moving sprite
+    costs about twice its own area.
+    """
+
+    def __init__(self, display, background=0):
+        self.display = display
+        self.background = background
+        self.sprites = []
+        self._epoch = display._epoch
+
+    def add(self, sprite):
+        self.sprites.append(sprite)
+        sprite.dirty = True
+        return sprite
+
+    def remove(self, sprite):
+        self.sprites.remove(sprite)
+        if sprite.drawn is not None:
+            self._restore(sprite)
+            self._touch(sprite.drawn)
+
+    def collisions(self, sprite):
+        return [s for s in self.sprites if s is not sprite and s.visible and sprite.collides(s)]
+
+    def invalidate(self):
+        # The screen under the sprites was repainted, draw them all again
+        for sprite in self.sprites:
+            sprite.drawn = None
+            sprite.dirty = True
+
+    def update(self):
+        if self.display._epoch != self._epoch:
+            # The screen was cleared since the last update
+            self._epoch = self.display._epoch
+            self.invalidate()
+        sprites = self.sprites
+        for sprite in sprites:
+            if sprite.dirty and sprite.drawn is not None:
+                self._restore(sprite)
+                self._touch(sprite.drawn)
+                sprite.drawn = None
+        for sprite in sprites:
+            if sprite.dirty:
+                sprite.dirty = False
+                if sprite.visible:
+                    self._draw(sprite)
+
+    def _touch(self, rect):
+        # A restored rectangle may have wiped part of a sprite that didn't move
+        for sprite in self.sprites:
+            if not sprite.dirty and sprite.visible and sprite._overlaps(rect):
+                sprite.dirty = True
+
+    def _restore(self, sprite):
+        x, y, w, h = sprite.drawn
+        if isinstance(self.background, Canvas):
+            self.display.blit_buffer(sprite._under, x, y, w, h)
+        else:
+            self.display.fill_rect(x, y, w, h, self.background)
+
+    def _grab(self, buffer, x, y, w, h):
+        # Copy the background rectangle into buffer, outside the canvas is black
+        canvas = self.background
+        fb = framebuf.FrameBuffer(buffer, w, h, framebuf.RGB565)
+        fb.fill(0)
+        fb.blit(canvas.fb, canvas.x - x, canvas.y - y)
+
+    def _draw(self, sprite):
+        w = sprite.width
+        h = sprite.height
+        image = sprite.frames[sprite.frame]
+        sprite.drawn = (sprite.x, sprite.y, w, h)
+        if isinstance(self.background, Canvas):
+            if sprite._under is None:
+                sprite._under = bytearray(w * h * 2)
+                sprite._composed = bytearray(w * h * 2)
+            self._grab(sprite._under, sprite.x, sprite.y, w, h)
+            if sprite.key is None:
+                self.display.blit_buffer(image.buffer, sprite.x, sprite.y, w, h)
+                return
+            composed = sprite._composed
+            composed[:] = sprite._under
+            fb = framebuf.FrameBuffer(composed, w, h, framebuf.RGB565)
+            fb.blit(image.fb, 0, 0, swap(sprite.key))
+            self.display.blit_buffer(composed, sprite.x, sprite.y, w, h)
+            return
+        if sprite.key is None:
+            self.display.blit_buffer(image.buffer, sprite.x, sprite.y, w, h)
+            return
+        # Over a solid color the composed frame doesn't depend on the position
+        buffer = sprite._cache.get(sprite.frame)
+        if buffer is None:
+            buffer = bytearray(w * h * 2)
+            fb = framebuf.FrameBuffer(buffer, w, h, framebuf.RGB565)
+            fb.fill(swap(self.background))
+            fb.blit(image.fb, 0, 0, swap(sprite.key))
+            sprite._cache[sprite.frame] = buffer
+        self.display.blit_buffer(buffer, sprite.x, sprite.y, w, h)
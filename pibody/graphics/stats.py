@@ -0,0 +1,142 @@
+from time import ticks_us, ticks_diff
+
+# Column/row address set-up and RAMWR bytes sent before every drawing window
+WINDOW_BYTES = 11
+
+
+def _text(display, args, kwargs):
+    text = args[0] if args else kwargs.get("text", "")
+    font = args[3] if len(args) > 3 else kwargs.get("font")
+    if font is None:
+        font = display.font_small
+    n = len(text)
+    return n * font.WIDTH * font.HEIGHT, n
+
+
+def _pixel(display, args, kwargs):
+    return 1, 1
+
+
+def _span(display, args, kwargs):
+    return max(args[2], 0), 1
+
+
+def _line(display, args, kwargs):
+    x0, y0, x1, y1 = args[:4]
+    n = max(abs(x1 - x0), abs(y1 - y0)) + 1
+    return n, n
+
+
+def _rect(display, args, kwargs):
+    w, h = args[2], args[3]
+    return 2 * (w + h), 4
+
+
+def _fill_rect(display, args, kwargs):
+    return max(args[2], 0) * max(args[3], 0), 1
+
+
+def _fill(display, args, kwargs):
+    return display.width * display.height, 1
+
+
+def _blit(display, args, kwargs):
+    return args[3] * args[4], 1
+
+
+def _unknown(display, args, kwargs):
+    return 0, 1
+
+
+# Primitives that talk to the panel themselves, with their (pixels, windows) estimate
+PRIMITIVES = {
+    "text": _text,
+    "pixel": _pixel,
+    "hline": _span,
+    "vline": _span,
+    "line": _line,
+    "rect": _rect,
+    "fill_rect": _fill_rect,
+    "fill": _fill,
+    "blit_buffer": _blit,
+    "png": _unknown,
+}
+
+# Widgets measured by what their nested primitive calls add up to
+COMPOSITES = ("linear_bar", "circular_bar", "print")
+
+
+class DisplayStats:
+    """Per-method counters: calls, pixels touched, estimated SPI bytes and cumulative ticks_us.
+
+    Wrappers are set on the display instance only while installed, so a
+    display without instrumentation runs the plain methods.
+    """
+
+    def __init__(self, display):
+        self.display = display
+        self.counters = {}
+        self.pixels = 0
+        self.spi_bytes = 0
+
+    def install(self):
+        d = self.display
+        for name, estimate in PRIMITIVES.items():
+            setattr(d, name, self._primitive(name, getattr(d, name), estimate))
+        for name in COMPOSITES:
+            setattr(d, name, self._composite(name, getattr(d, name)))
+
+    def uninstall(self):
+        for name in PRIMITIVES:
+            delattr(self.display, name)
+        for name in COMPOSITES:
+            delattr(self.display, name)
+
+    def reset(self):
+        for entry in self.counters.values():
+            entry[0] = entry[1] = entry[2] = entry[3] = 0
+        self.pixels = 0
+        self.spi_bytes = 0
+
+    def _primitive(self, name, method, estimate):
+        entry = self.counters[name] = [0, 0, 0, 0]
+        display = self.display
+
+        def wrapper(*args, **kwargs):
+            start = ticks_us()
+            result = method(*args, **kwargs)
+            elapsed = ticks_diff(ticks_us(), start)
+            pixels, windows = estimate(display, args, kwargs)
+            spi_bytes = 2 * pixels + WINDOW_BYTES * windows
+            entry[0] += 1
+            entry[1] += pixels
+            entry[2] += spi_bytes
+            entry[3] += elapsed
+            self.pixels += pixels
+            self.spi_bytes += spi_bytes
+            return result
+        return wrapper
+
+    def _composite(self, name, method):
+        entry = self.counters[name] = [0, 0, 0, 0]
+
+        def wrapper(*args, **kwargs):
+            pixels = self.pixels
+            spi_bytes = self.spi_bytes
+            start = ticks_us()
+            result = method(*args, **kwargs)
+            entry[3] += ticks_diff(ticks_us(), start)
+            entry[0] += 1
+            entry[1] += self.pixels - pixels
+            entry[2] += self.spi_bytes - spi_bytes
+            return result
+        return wrapper
+
+    def report(self):
+        # name -> (calls, pixels, spi_bytes, us), only for methods that were called
+        return {name: tuple(entry) for name, entry in self.counters.items() if entry[0]}
+
+    def dump(self, out=print):
+        out("{:<13}{:>7}{:>9}{:>9}{:>9}".format("method", "calls", "pixels", "bytes", "us"))
+        for name, (calls, pixels, spi_bytes, us) in sorted(self.report().items()):
+            out("{:<13}{:>7}{:>9}{:>9}{:>9}".format(name, calls, pixels, spi_bytes, us))
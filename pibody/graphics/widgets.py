@@ -0,0 +1,221 @@
+"""Retained widgets that remember what they drew and repaint only what changed.
+
+Widgets redraw completely after display.fill() or display.reset_gauges(),
+so clearing part of the screen by hand should be followed by reset_gauges().
+"""
+from ..Display import display as _display
+
+WHITE = 0xFFFF
+BLACK = 0x0000
+GREEN = 0x07E0
+
+# Single-character strings for repainting one glyph cell without allocating
+_CELLS = tuple(chr(c) for c in range(128))
+
+
+class Widget:
+    def __init__(self, x, y, display=None):
+        self.x = x
+        self.y = y
+        self.display = _display if display is None else display
+        self._epoch = None
+
+    def invalidate(self):
+        # Forget what is on screen, the next update repaints everything
+        self._epoch = None
+
+    def _fresh(self):
+        # True when the widget has to be drawn from scratch
+        epoch = self.display._epoch
+        if self._epoch != epoch:
+            self._epoch = epoch
+            return True
+        return False
+
+
+class Label(Widget):
+    """Text of up to width characters; only changed glyph cells are repainted."""
+
+    def __init__(self, x, y, width, font=None, fg=WHITE, bg=BLACK, display=None):
+        super().__init__(x, y, display)
+        self.width = width
+        self.font = font
+        self.fg = fg
+        self.bg = bg
+        self.text = ""
+
+    def set(self, text, fg=None):
+        d = self.display
+        font = self.font or d.font_small
+        if fg is not None and fg != self.fg:
+            self.fg = fg
+            self.invalidate()
+        text = text[:self.width]
+        cell = font.WIDTH
+        if self._fresh():
+            if text:
+                d.text(text, self.x, self.y, font, self.fg, self.bg)
+            d.fill_rect(self.x + len(text) * cell, self.y, (self.width - len(text)) * cell, font.HEIGHT, self.bg)
+            self.text = text
+            return
+        old = self.text
+        if text is old or text == old:
+            return
+        n = min(len(text), len(old))
+        i = 0
+        while i < n:
+            if text[i] == old[i]:
+                i += 1
+                continue
+            j = i + 1
+            while j < n and text[j] != old[j]:
+                j += 1
+            d.text(text[i:j], self.x + i * cell, self.y, font, self.fg, self.bg)
+            i = j
+        if len(text) > n:
+            d.text(text[n:], self.x + n * cell, self.y, font, self.fg, self.bg)
+        elif len(old) > n:
+            d.fill_rect(self.x + n * cell, self.y, (len(old) - n) * cell, font.HEIGHT, self.bg)
+        self.text = text
+
+
+class StatusLine(Label):
+    """A label spanning the whole display width."""
+
+    def __init__(self, y, font=None, fg=WHITE, bg=BLACK, x=0, display=None):
+        super().__init__(x, y, 0, font, fg, bg, display)
+
+    def set(self, text, fg=None):
+        if not self.width:
+            font = self.font or self.display.font_small
+            self.width = (self.display.width - self.x) // font.WIDTH
+        super().set(text, fg)
+
+
+class NumberField(Widget):
+    """Fixed-width numeric readout between a static prefix and suffix.
+
+    The number is formatted into a preallocated buffer and only the
+    changed digit cells are repainted. set(None) shows dashes.
+    """
+
+    def __init__(self, x, y, digits, prefix="", suffix="", decimals=0, font=None, fg=WHITE, bg=BLACK, display=None):
+        super().__init__(x, y, display)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.decimals = decimals
+        self.font = font
+        self.fg = fg
+        self.bg = bg
+        self._scale = 10 ** decimals
+        self._buf = bytearray(digits)
+        self._old = bytearray(digits)
+
+    def _format(self, value):
+        buf = self._buf
+        n = len(buf)
+        if value is None:
+            for i in range(n):
+                buf[i] = 45
+            return
+        if self.decimals:
+            value = int(round(value * self._scale))
+        else:
+            value = int(value)
+        negative = value < 0
+        if negative:
+            value = -value
+
+        digits = 1
+        rest = value // self._scale
+        while rest >= 10:
+            rest //= 10
+            digits += 1
+        need = digits + (self.decimals + 1 if self.decimals else 0) + negative
+        if need > n:
+            for i in range(n):
+                buf[i] = 35
+            return
+
+        i = n
+        for _ in range(self.decimals):
+            i -= 1
+            buf[i] = 48 + value % 10
+            value //= 10
+        if self.decimals:
+            i -= 1
+            buf[i] = 46
+        while True:
+            i -= 1
+            buf[i] = 48 + value % 10
+            value //= 10
+            if value == 0:
+                break
+        if negative:
+            i -= 1
+            buf[i] = 45
+        while i > 0:
+            i -= 1
+            buf[i] = 32
+
+    def set(self, value):
+        d = self.display
+        font = self.font or d.font_small
+        cell = font.WIDTH
+        self._format(value)
+        buf = self._buf
+        old = self._old
+        x = self.x + len(self.prefix) * cell
+        fresh = self._fresh()
+        if fresh:
+            if self.prefix:
+                d.text(self.prefix, self.x, self.y, font, self.fg, self.bg)
+            if self.suffix:
+                d.text(self.suffix, x + len(buf) * cell, self.y, font, self.fg, self.bg)
+        for i in range(len(buf)):
+            if fresh or buf[i] != old[i]:
+                d.text(_CELLS[buf[i]], x + i * cell, self.y, font, self.fg, self.bg)
+                old[i] = buf[i]
+
+
+class LinearGauge(Widget):
+    """Horizontal bar repainted incrementally through display.linear_bar."""
+
+    def __init__(self, x, y, length, min_value, max_value, height=5, border=False, color=GREEN, border_color=WHITE, background_color=BLACK, display=None):
+        super().__init__(x, y, display)
+        self.length = length
+        self.min_value = min_value
+        self.max_value = max_value
+        self.height = height
+        self.border = border
+        self.color = color
+        self.border_color = border_color
+        self.background_color = background_color
+
+    def set(self, value, color=None):
+        if color is not None:
+            self.color = color
+        self.display.linear_bar(
+            self.x, self.y, self.length, value, self.min_value, self.max_value,
+            height=self.height, border=self.border, color=self.color,
+            border_color=self.border_color, background_color=self.background_color,
+            incremental=not self._fresh())
+
+
+class CircularGauge(Widget):
+    """Ring gauge repainted incrementally through display.circular_bar."""
+
+    def __init__(self, x, y, r, min_value, max_value, width=2, color=GREEN, background_color=WHITE, display=None):
+        super().__init__(x, y, display)
+        self.r = r
+        self.min_value = min_value
+        self.max_value = max_value
+        self.width = width
+        self.color = color
+        self.background_color = background_color
+
+    def set(self, value):
+        self.display.circular_bar(
+            self.x, self.y, self.r, value, self.min_value, self.max_value,
+            width=self.width, color=self.color, background_color=self.background_color,
+            incremental=not self._fresh())
@@ -28,4 +28,57 @@ def get_pin(slot):
     elif type(slot) == str:
         return get_pins_by_slot(slot)[0]
     else:
-        raise ValueError("Wrong slot type")
\ No newline at end of file
+        raise ValueError("Wrong slot type")
+
+# Shared I2C buses
+I2C_FREQ = 400000
+# (sda, scl) -> [bus, is_hardware, freq]
+_i2c_buses = {}
+# Hardware I2C index -> (sda, scl) it is driving
+_hard_i2c_pins = {}
+
+def _hard_i2c_index(sda, scl):
+    from pibody.Demo.module import SLOT_MAP
+    for pins in SLOT_MAP.values():
+        if len(pins) > 2 and pins[0] == sda and pins[1] == scl:
+            return pins[2]
+    return None
+
+def get_i2c_bus(slot, freq=None, hard_i2c=None):
+    """The one I2C bus of a slot, shared by every sensor plugged into it.
+
+    With hard_i2c=None the slot's hardware I2C is used unless that
+    peripheral already drives another slot, then SoftI2C. True or False
+    asks for one kind, a slot whose bus is of the other kind raises
+    ValueError. freq sets the clock of a new or existing bus.
+    """
+    from machine import I2C, SoftI2C, Pin
+    sda, scl = get_pins_by_slot(slot)
+    index = _hard_i2c_index(sda, scl)
+    entry = _i2c_buses.get((sda, scl))
+    if entry is not None and hard_i2c is not None and entry[1] != hard_i2c:
+        # Other drivers still use the pins through the existing bus
+        kind = "hardware I2C" if entry[1] else "SoftI2C"
+        raise ValueError(f"Slot '{slot}' is already used as {kind}")
+    if entry is None:
+        if hard_i2c is None:
+            hard_i2c = index is not None and index not in _hard_i2c_pins
+        freq = freq or I2C_FREQ
+        if hard_i2c:
+            if index is None:
+                raise ValueError(f"Slot '{slot}' has no hardware I2C")
+            if index in _hard_i2c_pins:
+                raise ValueError(f"Hardware I2C{index} is already used by pins {_hard_i2c_pins[index]}")
+            bus = I2C(index, scl=Pin(scl), sda=Pin(sda), freq=freq)
+            _hard_i2c_pins[index] = (sda, scl)
+        else:
+            bus = SoftI2C(scl=Pin(scl), sda=Pin(sda), freq=freq)
+        entry = _i2c_buses[(sda, scl)] = [bus, hard_i2c, freq]
+    elif freq is not None and freq != entry[2]:
+        if entry[1]:
+            # The port hands back the same peripheral object, reconfigured
+            I2C(index, scl=Pin(scl), sda=Pin(sda), freq=freq)
+        else:
+            entry[0].init(scl=Pin(scl), sda=Pin(sda), freq=freq)
+        entry[2] = freq
+    return entry[0]
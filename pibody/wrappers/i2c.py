@@ -1,5 +1,5 @@
-from machine import I2C, SoftI2C, Pin
-from pibody.helper import get_pins_by_slot
+from machine import I2C, SoftI2C
+from pibody.helper import get_i2c_bus
 
 from BME280 import BME280
 from MPU6050 import MPU6050
@@ -10,23 +10,20 @@ from SSD1306 import SSD1306
 
 
 
-def get_i2c(slot, hard_i2c=False):
+def get_i2c(slot, hard_i2c=None):
+    # hard_i2c=None picks hardware I2C when the slot's peripheral is free
     if type(slot) == I2C or type(slot) == SoftI2C:
         return slot
-    sda, scl = get_pins_by_slot(slot)
-    if hard_i2c:
-        return I2C(scl=Pin(scl), sda=Pin(sda))
-    else:
-        return SoftI2C(scl=Pin(scl), sda=Pin(sda))
+    return get_i2c_bus(slot, hard_i2c=hard_i2c)
 
 
 
 class ClimateSensor(BME280):
-    def __init__(self, slot, hard_i2c=False):
+    def __init__(self, slot, hard_i2c=None):
         super().__init__(get_i2c(slot, hard_i2c))
 
 
-def GyroAccel(slot, hard_i2c=False):
+def GyroAccel(slot, hard_i2c=None):
     i2c = get_i2c(slot, hard_i2c)
     if 0x68 in i2c.scan():
         return MPU6050(i2c)
@@ -36,13 +33,13 @@ def GyroAccel(slot, hard_i2c=False):
         raise ValueError(f"Invalid i2c address '{i2c.scan()}' for slot '{slot}'")  
 
 class ColorSensor(VEML6040):
-    def __init__(self, slot, hard_i2c=False):
+    def __init__(self, slot, hard_i2c=None):
         super().__init__(get_i2c(slot, hard_i2c))
 
 class DistanceSensor(VL53L0X):
-    def __init__(self, slot, hard_i2c=False):
+    def __init__(self, slot, hard_i2c=None):
         super().__init__(get_i2c(slot, hard_i2c))
 
 class OLED(SSD1306):
-    def __init__(self, slot, hard_i2c=False, width=128, height=64):
+    def __init__(self, slot, hard_i2c=None, width=128, height=64):
         super().__init__(get_i2c(slot, hard_i2c), width=width, height=height)